@@ -11,7 +11,7 @@ from fastapi import APIRouter, Depends, Query
 from fastapi import WebSocket, WebSocketDisconnect
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, insert
 
 from app.server import deps
 from app.server.api.dependencies import get_image_service
@@ -197,6 +197,8 @@ class CacheMigrateResponse(BaseModel):
 def _upsert_cache_record(
     session: Session,
     *,
+    existing: Optional[CacheRecord],
+    pending: list[dict],
     line_key: str,
     seq_no: int,
     surface: str,
@@ -204,16 +206,7 @@ def _upsert_cache_record(
     meta: Optional[dict],
     disk_cache_enabled: bool,
 ) -> bool:
-    existing = (
-        session.query(CacheRecord)
-        .filter(
-            CacheRecord.line_key == line_key,
-            CacheRecord.seq_no == seq_no,
-            CacheRecord.surface == surface,
-            CacheRecord.view == view,
-        )
-        .one_or_none()
-    )
+    """更新/删除已有记录；新记录只追加到 pending，由调用方一次 executemany 批量插入。"""
     if not meta:
         if existing is not None:
             session.delete(existing)
@@ -234,7 +227,7 @@ def _upsert_cache_record(
         "meta_json": json.dumps(meta, ensure_ascii=False),
     }
     if existing is None:
-        session.add(CacheRecord(**payload))
+        pending.append(payload)
     else:
         for key, value in payload.items():
             setattr(existing, key, value)
@@ -365,12 +358,26 @@ def scan_cache_records(
         )
         seqs = [int(record.seqNo) for record in records]
 
+    # 一次查询取回全部已有记录，代替每个 (seq_no, surface) 一次 SELECT。
+    existing_map: dict[tuple[int, str], CacheRecord] = {}
+    if seqs:
+        existing_map = {
+            (int(record.seq_no), str(record.surface)): record
+            for record in management_db.query(CacheRecord).filter(
+                CacheRecord.line_key == line_key,
+                CacheRecord.view == view,
+                CacheRecord.seq_no.in_(seqs),
+            )
+        }
+    pending: list[dict] = []
     updated = 0
     for seq_no in seqs:
         meta_map = image_service.read_disk_cache_meta(seq_no)
         for surface in ("top", "bottom"):
             changed = _upsert_cache_record(
                 management_db,
+                existing=existing_map.get((seq_no, surface)),
+                pending=pending,
                 line_key=line_key,
                 seq_no=seq_no,
                 surface=surface,
@@ -380,6 +387,8 @@ def scan_cache_records(
             )
             if changed:
                 updated += 1
+    if pending:
+        management_db.execute(insert(CacheRecord), pending)
     management_db.commit()
     return CacheScanResponse(updated=updated, seq_nos=seqs)
 
@@ -1,12 +1,12 @@
 from __future__ import annotations
 
-from typing import Optional
+from typing import Literal, Optional
 import threading
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 
 from app.server.api.dependencies import get_defect_service, get_image_service
-from app.server.api.utils import defect_class_label, grade_to_severity, get_defect_class_payload
+from app.server.api.utils import defect_class_labels, grade_to_severity, get_defect_class_payload
 from app.server.schemas import SurfaceImageInfo, UiDefectItem, UiDefectResponse
 from app.server.services.defect_service import DefectService
 from app.server.services.image_service import ImageService
@@ -17,11 +17,15 @@ router = APIRouter(prefix="/api")
 @router.get("/defects/{seq_no}", response_model=UiDefectResponse)
 def api_defects(
     seq_no: int,
-    surface: Optional[str] = Query(default=None, pattern="^(top|bottom)$"),
+    response: Response,
+    surface: Optional[Literal["top", "bottom"]] = Query(default=None),
     service: DefectService = Depends(get_defect_service),
     image_service: ImageService = Depends(get_image_service),
 ):
     base = service.defects_by_seq(seq_no, surface=surface)
+    if not base.items:
+        # 与 DefectService 一致：尚在检测的板返回的空列表不进入响应缓存。
+        response.headers["Cache-Control"] = "no-store"
     defects: list[UiDefectItem] = []
 
     # SMALL 实例：如果配置了像素缩放（例如 0.5），则需要对 bbox_source/bbox_image 做对应缩放，
@@ -39,6 +43,7 @@ def api_defects(
     if scale_y <= 0:
         scale_y = 1.0
 
+    labels = defect_class_labels()
     for record in base.items:
         bbox = record.bbox_source
         bbox_obj = record.bbox_object
@@ -69,10 +74,11 @@ def api_defects(
             height_mm = max(0, bottom_mm - top_mm)
         else:
             left_mm = top_mm = width_mm = height_mm = None
-        defect_type = defect_class_label(record.class_id)
+        defect_type = labels.get(record.class_id, "未知缺陷")  # class_id 为 None 时同样落到默认值
         severity = grade_to_severity(record.grade)
+        # DefectRecord 已经过校验，这里只做字段换算：model_construct 跳过逐条重复校验。
         defects.append(
-            UiDefectItem(
+            UiDefectItem.model_construct(
                 defect_id=str(record.defect_id),
                 defect_type=defect_type,
                 severity=severity,  # type: ignore[arg-type]
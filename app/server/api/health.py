@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from datetime import datetime
+import time
+from datetime import datetime, timezone
 
 from fastapi import APIRouter
 from fastapi.responses import StreamingResponse
@@ -15,22 +16,28 @@ API_VERSION = "0.1.0"
 router = APIRouter()
 
 
-@router.get("/health", response_model=HealthStatus)
-def healthcheck():
-    """健康检查接口，用于判断服务是否存活及数据库大致状态。"""
+# 存活探针每隔几秒调用一次：1 秒内复用上次探测结果，避免每次都占用连接池执行 SELECT 1。
+HEALTH_CACHE_TTL_SECONDS = 1.0
+_health_cache: tuple[float, HealthStatus] | None = None
+
+
+def _probe_health() -> HealthStatus:
     db_connected = False
     latency_ms: float | None = None
+    started = time.perf_counter()
     try:
         with deps.get_main_db_context() as session:
             session.execute(text("SELECT 1"))
             db_connected = True
+            latency_ms = round((time.perf_counter() - started) * 1000, 2)
     except Exception:  # pragma: no cover - 健康检查中容错
         db_connected = False
 
     status = "healthy" if db_connected else "unhealthy"
     return HealthStatus(
         status=status,
-        timestamp=datetime.utcnow(),
+        # 保持原有的无时区 UTC 时间格式（datetime.utcnow() 已弃用）
+        timestamp=datetime.now(timezone.utc).replace(tzinfo=None),
         version=API_VERSION,
         database={
             "connected": db_connected,
@@ -39,6 +46,19 @@ def healthcheck():
     )
 
 
+@router.get("/health", response_model=HealthStatus)
+def healthcheck():
+    """健康检查接口，用于判断服务是否存活及数据库大致状态。"""
+    global _health_cache
+    now = time.monotonic()
+    cached = _health_cache
+    if cached is not None and now - cached[0] < HEALTH_CACHE_TTL_SECONDS:
+        return cached[1]
+    result = _probe_health()
+    _health_cache = (now, result)
+    return result
+
+
 @router.get("/api/health", response_model=HealthStatus)
 def healthcheck_api():
     return healthcheck()
@@ -1,10 +1,18 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import logging
-from typing import Optional, List
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from pathlib import Path
+from typing import List, Literal, Optional
 from pydantic import BaseModel, Field
 
 from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import FileResponse
 
 from app.server.api.dependencies import get_image_service
 from app.server.services.image_service import ImageService
@@ -23,11 +31,11 @@ class TileInfo(BaseModel):
 
 
 class TilePreheatRequest(BaseModel):
-    surface: str = Field(..., pattern="^(top|bottom)$")
+    surface: Literal["top", "bottom"] = Field(...)
     seq_no: int = Field(..., ge=0)
     tiles: List[TileInfo] = Field(...)
     view: Optional[str] = Field(default=None)
-    priority: Optional[str] = Field(default="normal", pattern="^(low|normal|high)$")
+    priority: Optional[Literal["low", "normal", "high"]] = Field(default="normal")
 
 
 class TilePreheatResponse(BaseModel):
@@ -37,8 +45,162 @@ class TilePreheatResponse(BaseModel):
     details: Optional[dict] = None
 
 
-def _image_media_type(fmt: str) -> str:
-    return f"image/{fmt.lower()}"
+# 解码/缩放/编码放到独立线程池执行：Pillow 编解码期间释放 GIL，可用满多核；
+# 与 Starlette 默认线程池隔离，大量瓦片请求不会挤占 /api/steels 等 JSON 接口。
+# ImageService 持有线程与锁，不可 pickle，因此不用进程池。
+_IMAGE_POOL: ThreadPoolExecutor | None = None
+_IMAGE_POOL_LOCK = threading.Lock()
+
+
+def _image_pool() -> ThreadPoolExecutor:
+    global _IMAGE_POOL
+    if _IMAGE_POOL is None:
+        with _IMAGE_POOL_LOCK:
+            if _IMAGE_POOL is None:
+                _IMAGE_POOL = ThreadPoolExecutor(
+                    max_workers=os.cpu_count() or 4, thread_name_prefix="image-worker"
+                )
+    return _IMAGE_POOL
+
+
+def shutdown_image_pool() -> None:
+    global _IMAGE_POOL
+    with _IMAGE_POOL_LOCK:
+        pool, _IMAGE_POOL = _IMAGE_POOL, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def _run_image_work(func, /, *args, **kwargs):
+    return await asyncio.get_running_loop().run_in_executor(_image_pool(), partial(func, *args, **kwargs))
+
+
+# 同一参数的并发请求（多个浏览器标签/瓦片同时请求同一张图）只计算一次，其余请求等待同一结果。
+# 所有协程都运行在同一事件循环上，普通 dict 即可，无需加锁。
+_INFLIGHT: dict[tuple, asyncio.Future] = {}
+
+
+def _forget_inflight(key: tuple, future: asyncio.Future) -> None:
+    if _INFLIGHT.get(key) is future:
+        del _INFLIGHT[key]
+
+
+async def _single_flight(key: tuple, func):
+    future = _INFLIGHT.get(key)
+    if future is None:
+        future = asyncio.get_running_loop().run_in_executor(_image_pool(), func)
+        _INFLIGHT[key] = future
+        future.add_done_callback(partial(_forget_inflight, key))
+    # shield：某个请求被取消（客户端断开）时不影响其他等待同一结果的请求
+    return await asyncio.shield(future)
+
+
+# 接口层只接受这几种输出格式：非法 fmt 在参数校验阶段即返回 422，不会进入 Pillow。
+ImageFmt = Literal["JPEG", "PNG", "WEBP"]
+
+_MEDIA_TYPES: dict[str, str] = {
+    "JPEG": "image/jpeg",
+    "PNG": "image/png",
+    "WEBP": "image/webp",
+}
+
+
+def _image_media_type(fmt: ImageFmt) -> str:
+    return _MEDIA_TYPES[fmt]
+
+
+@lru_cache(maxsize=8)
+def _settings_tag(service: ImageService) -> str:
+    """图像配置（默认扩展像素、帧尺寸等）参与 ETag，配置变更后旧缓存自然失效。"""
+    raw = service.settings.images.model_dump_json().encode("utf-8")
+    return hashlib.blake2b(raw, digest_size=8).hexdigest()
+
+
+def _param_etag(service: ImageService, *params) -> str:
+    """单帧/裁剪图只由请求参数决定（帧落盘后不再变化），无需生成图像即可判断 304。"""
+    raw = repr((_settings_tag(service), params)).encode("utf-8")
+    return '"' + hashlib.blake2b(raw, digest_size=16).hexdigest() + '"'
+
+
+def _content_etag(payload: bytes) -> str:
+    """拼接图/瓦片在钢板采集过程中会随新帧变化，只能按内容生成 ETag。"""
+    return '"' + hashlib.blake2b(payload, digest_size=16).hexdigest() + '"'
+
+
+def _file_etag(path: Path, stat: os.stat_result) -> str:
+    """磁盘缓存瓦片按路径 + mtime + 大小生成 ETag，无需读取文件内容。"""
+    raw = f"{path}:{stat.st_mtime_ns}:{stat.st_size}".encode("utf-8")
+    return '"' + hashlib.blake2b(raw, digest_size=16).hexdigest() + '"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in candidates or "*" in candidates
+
+
+def _cache_headers(service: ImageService, etag: str, *, immutable: bool) -> dict[str, str]:
+    cache_ttl = int(getattr(service.settings.memory_cache, "ttl_seconds", 120) or 120)
+    cache_control = f"public, max-age={cache_ttl}"
+    if immutable:
+        cache_control += ", immutable"
+    return {"ETag": etag, "Cache-Control": cache_control}
+
+
+def _not_modified(headers: dict[str, str]) -> Response:
+    return Response(status_code=304, headers=headers)
+
+
+def _parse_byte_range(range_header: str, total: int) -> Optional[tuple[int, int]]:
+    """解析单段 Range（bytes=s-e / bytes=s- / bytes=-n），返回闭区间；多段或格式不符返回 None。"""
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    start_text, sep, end_text = spec.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        if not start_text:
+            suffix = int(end_text)
+            if suffix <= 0:
+                return None
+            return max(0, total - suffix), total - 1
+        start = int(start_text)
+        end = int(end_text) if end_text else None
+    except ValueError:
+        return None
+    if end is None:
+        # 开放区间不与 total 比较大小，起点越界时交给调用方返回 416
+        return start, total - 1
+    if start > end:
+        return None
+    return start, min(end, total - 1)
+
+
+def _ranged_response(request: Request, payload: bytes, media_type: str, headers: dict[str, str]) -> Response:
+    """
+    拼接图/瓦片支持 Range 断点续传：单段范围返回 206，越界返回 416，其余情况返回完整内容。
+    If-Range 与当前 ETag 不一致时按规范返回完整内容。
+    """
+    headers = {**headers, "Accept-Ranges": "bytes"}
+    range_header = request.headers.get("range")
+    if not range_header or not payload:
+        return Response(content=payload, media_type=media_type, headers=headers)
+    if_range = request.headers.get("if-range")
+    if if_range and if_range.strip() != headers.get("ETag"):
+        return Response(content=payload, media_type=media_type, headers=headers)
+    total = len(payload)
+    byte_range = _parse_byte_range(range_header, total)
+    if byte_range is None:
+        return Response(content=payload, media_type=media_type, headers=headers)
+    start, end = byte_range
+    if start >= total:
+        return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{total}"})
+    headers["Content-Range"] = f"bytes {start}-{end}/{total}"
+    return Response(content=payload[start : end + 1], status_code=206, media_type=media_type, headers=headers)
+
 
 def _apply_scale(payload: bytes, scale: float, fmt: str, service: ImageService) -> bytes:
     if not payload or scale is None or scale <= 0:
@@ -59,19 +221,24 @@ def _apply_scale(payload: bytes, scale: float, fmt: str, service: ImageService)
 
 
 @router.get("/images/frame")
-def api_frame_image(
-    surface: str = Query(..., pattern="^(top|bottom)$"),
+async def api_frame_image(
+    request: Request,
+    surface: Literal["top", "bottom"] = Query(...),
     seq_no: int = Query(...),
     image_index: int = Query(..., ge=0),
     width: Optional[int] = Query(default=None, ge=1, le=8192),
     height: Optional[int] = Query(default=None, ge=1, le=8192),
     view: Optional[str] = Query(default=None),
     scale: float = Query(default=1.0, gt=0.0, le=1.0),
-    fmt: str = Query(default="JPEG"),
+    fmt: ImageFmt = Query(default="JPEG"),
     service: ImageService = Depends(get_image_service),
 ):
     """获取单帧图像，支持指定上下表面、视角与目标尺寸。"""
-    try:
+    etag = _param_etag(service, "frame", surface, seq_no, image_index, view, width, height, scale, fmt)
+    cache_headers = _cache_headers(service, etag, immutable=True)
+    if _etag_matches(request, etag):
+        return _not_modified(cache_headers)
+    def _render() -> bytes:
         payload = service.get_frame(
             surface=surface,
             seq_no=seq_no,
@@ -81,26 +248,35 @@ def api_frame_image(
             height=height,
             fmt=fmt,
         )
-        payload = _apply_scale(payload, scale, fmt, service)
-        return Response(content=payload, media_type=_image_media_type(fmt))
+        return _apply_scale(payload, scale, fmt, service)
+
+    try:
+        payload = await _single_flight(("frame", etag), _render)
+        return Response(content=payload, media_type=_image_media_type(fmt), headers=cache_headers)
     except FileNotFoundError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
 
 
 @router.get("/images/defect/{defect_id}")
-def api_defect_crop(
+async def api_defect_crop(
+    request: Request,
     defect_id: int,
-    surface: str = Query(..., pattern="^(top|bottom)$"),
+    surface: Literal["top", "bottom"] = Query(...),
     # 若不传 expand，后端将使用配置中的 defect_cache_expand 作为默认扩展像素
     expand: Optional[int] = Query(default=None, ge=0, le=512),
     width: Optional[int] = Query(default=None, ge=1, le=4096),
     height: Optional[int] = Query(default=None, ge=1, le=4096),
     force_crop: bool = Query(default=False),
     scale: float = Query(default=1.0, gt=0.0, le=1.0),
-    fmt: str = Query(default="JPEG"),
+    fmt: ImageFmt = Query(default="JPEG"),
     service: ImageService = Depends(get_image_service),
 ):
     """按缺陷 ID 裁剪缺陷区域，并在响应头返回缺陷元数据。"""
+    etag = _param_etag(service, "defect", surface, defect_id, expand, width, height, scale, fmt)
+    cache_headers = _cache_headers(service, etag, immutable=True)
+    # force_crop 用于强制重新裁剪，不走协商缓存
+    if not force_crop and _etag_matches(request, etag):
+        return _not_modified(cache_headers)
     try:
         logger.info(
             "defect crop request id=%s surface=%s expand=%s width=%s height=%s fmt=%s",
@@ -111,20 +287,25 @@ def api_defect_crop(
             height,
             fmt,
         )
-        data, defect = service.crop_defect(
-            surface=surface,
-            defect_id=defect_id,
-            expand=expand,
-            width=width,
-            height=height,
-            fmt=fmt,
-            use_cache=not force_crop,
-        )
-        data = _apply_scale(data, scale, fmt, service)
+
+        def _render():
+            data, defect = service.crop_defect(
+                surface=surface,
+                defect_id=defect_id,
+                expand=expand,
+                width=width,
+                height=height,
+                fmt=fmt,
+                use_cache=not force_crop,
+            )
+            return _apply_scale(data, scale, fmt, service), defect
+
+        data, defect = await _single_flight(("defect", etag, force_crop), _render)
         headers = {
             "X-Seq-No": str(defect.seq_no),
             "X-Image-Index": str(defect.image_index or 0),
             "X-Camera-Id": str(defect.camera_id),
+            **cache_headers,
         }
         return Response(content=data, media_type=_image_media_type(fmt), headers=headers)
     except FileNotFoundError as exc:
@@ -132,8 +313,9 @@ def api_defect_crop(
 
 
 @router.get("/images/crop")
-def api_custom_crop(
-    surface: str = Query(..., pattern="^(top|bottom)$"),
+async def api_custom_crop(
+    request: Request,
+    surface: Literal["top", "bottom"] = Query(...),
     defect_id: Optional[int] = Query(default=None, ge=1),
     seq_no: Optional[int] = Query(default=None),
     image_index: Optional[int] = Query(default=None),
@@ -146,55 +328,70 @@ def api_custom_crop(
     height: Optional[int] = Query(default=None, ge=1, le=4096),
     force_crop: bool = Query(default=False),
     scale: float = Query(default=1.0, gt=0.0, le=1.0),
-    fmt: str = Query(default="JPEG"),
+    fmt: ImageFmt = Query(default="JPEG"),
     service: ImageService = Depends(get_image_service),
 ):
     """按自定义坐标裁剪指定帧，支持扩展边界及输出尺寸。"""
+    etag = _param_etag(
+        service, "crop", surface, defect_id, seq_no, image_index, x, y, w, h, expand, width, height, scale, fmt
+    )
+    cache_headers = _cache_headers(service, etag, immutable=True)
+    if not force_crop and _etag_matches(request, etag):
+        return _not_modified(cache_headers)
     try:
         if defect_id is not None:
-            payload, defect = service.crop_defect(
-                surface=surface,
-                defect_id=defect_id,
-                expand=expand,
-                width=width,
-                height=height,
-                fmt=fmt,
-                use_cache=not force_crop,
-            )
-            payload = _apply_scale(payload, scale, fmt, service)
+
+            def _render_defect():
+                data, defect = service.crop_defect(
+                    surface=surface,
+                    defect_id=defect_id,
+                    expand=expand,
+                    width=width,
+                    height=height,
+                    fmt=fmt,
+                    use_cache=not force_crop,
+                )
+                return _apply_scale(data, scale, fmt, service), defect
+
+            payload, defect = await _single_flight(("crop", etag, force_crop), _render_defect)
             headers = {
                 "X-Seq-No": str(defect.seq_no),
                 "X-Image-Index": str(defect.image_index or 0),
                 "X-Camera-Id": str(defect.camera_id),
                 "X-Defect-Id": str(defect.defect_id),
+                **cache_headers,
             }
             return Response(content=payload, media_type=_image_media_type(fmt), headers=headers)
 
         if seq_no is None or image_index is None or x is None or y is None or w is None or h is None:
             raise HTTPException(status_code=400, detail="Missing crop parameters")
 
-        payload = service.crop_custom(
-            surface=surface,
-            seq_no=seq_no,
-            image_index=image_index,
-            x=x,
-            y=y,
-            w=w,
-            h=h,
-            expand=expand,
-            width=width,
-            height=height,
-            fmt=fmt,
-        )
-        payload = _apply_scale(payload, scale, fmt, service)
-        return Response(content=payload, media_type=_image_media_type(fmt))
+        def _render() -> bytes:
+            payload = service.crop_custom(
+                surface=surface,
+                seq_no=seq_no,
+                image_index=image_index,
+                x=x,
+                y=y,
+                w=w,
+                h=h,
+                expand=expand,
+                width=width,
+                height=height,
+                fmt=fmt,
+            )
+            return _apply_scale(payload, scale, fmt, service)
+
+        payload = await _single_flight(("crop", etag, force_crop), _render)
+        return Response(content=payload, media_type=_image_media_type(fmt), headers=cache_headers)
     except FileNotFoundError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
 
 
 @router.get("/images/mosaic")
-def api_mosaic_image(
-    surface: str = Query(..., pattern="^(top|bottom)$"),
+async def api_mosaic_image(
+    request: Request,
+    surface: Literal["top", "bottom"] = Query(...),
     seq_no: int = Query(...),
     view: Optional[str] = Query(default=None),
     limit: Optional[int] = Query(default=None, ge=1, le=10000),
@@ -203,11 +400,11 @@ def api_mosaic_image(
     width: Optional[int] = Query(default=None, ge=1),
     height: Optional[int] = Query(default=None, ge=1),
     scale: float = Query(default=1.0, gt=0.0, le=1.0),
-    fmt: str = Query(default="JPEG"),
+    fmt: ImageFmt = Query(default="JPEG"),
     service: ImageService = Depends(get_image_service),
 ):
     """生成指定序列的长带拼接图，可配置抽帧、跳过数量和尺寸。"""
-    try:
+    def _render() -> bytes:
         payload = service.get_mosaic(
             surface=surface,
             seq_no=seq_no,
@@ -219,16 +416,23 @@ def api_mosaic_image(
             height=height,
             fmt=fmt,
         )
-        payload = _apply_scale(payload, scale, fmt, service)
-        return Response(content=payload, media_type=_image_media_type(fmt))
+        return _apply_scale(payload, scale, fmt, service)
+
+    try:
+        key = ("mosaic", surface, seq_no, view, limit, skip, stride, width, height, scale, fmt)
+        payload = await _single_flight(key, _render)
+        cache_headers = _cache_headers(service, _content_etag(payload), immutable=False)
+        if _etag_matches(request, cache_headers["ETag"]):
+            return _not_modified(cache_headers)
+        return _ranged_response(request, payload, _image_media_type(fmt), cache_headers)
     except FileNotFoundError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
 
 
 @router.get("/images/tile")
-def api_tile_image(
+async def api_tile_image(
     request: Request,
-    surface: str = Query(..., pattern="^(top|bottom)$"),
+    surface: Literal["top", "bottom"] = Query(...),
     seq_no: int = Query(...),
     view: Optional[str] = Query(default=None),
     level: int = Query(default=0, ge=0, le=16),
@@ -236,13 +440,13 @@ def api_tile_image(
     tile_y: int = Query(..., ge=0),
     width: Optional[int] = Query(default=None, ge=1, le=16384),
     height: Optional[int] = Query(default=None, ge=1, le=16384),
-    orientation: str = Query(default="vertical", pattern="^(horizontal|vertical)$"),
+    orientation: Literal["horizontal", "vertical"] = Query(default="vertical"),
     prefetch: Optional[str] = Query(default=None),
     prefetch_x: Optional[float] = Query(default=None),
     prefetch_y: Optional[float] = Query(default=None),
     prefetch_image_index: Optional[int] = Query(default=None, ge=0),
     scale: float = Query(default=1.0, gt=0.0, le=1.0),
-    fmt: str = Query(default="JPEG"),
+    fmt: ImageFmt = Query(default="JPEG"),
     viewer_id: Optional[str] = Header(default=None, alias="X-Viewer-Id"),
     service: ImageService = Depends(get_image_service),
 ):
@@ -258,30 +462,16 @@ def api_tile_image(
                 resolved_viewer_id = forwarded
             elif request.client:
                 resolved_viewer_id = request.client.host
-        payload = service.get_tile(
-            surface=surface,
-            seq_no=seq_no,
-            view=view,
-            level=level,
-            tile_x=tile_x,
-            tile_y=tile_y,
-            orientation=orientation,
-            width=width,
-            height=height,
-            fmt=fmt,
-            viewer_id=resolved_viewer_id,
-            prefetch=(
-                {
-                    "mode": prefetch,
-                    "x": prefetch_x,
-                    "y": prefetch_y,
-                    "image_index": prefetch_image_index,
-                }
-                if prefetch
-                else None
-            ),
+        prefetch_payload = (
+            {
+                "mode": prefetch,
+                "x": prefetch_x,
+                "y": prefetch_y,
+                "image_index": prefetch_image_index,
+            }
+            if prefetch
+            else None
         )
-        payload = _apply_scale(payload, scale, fmt, service)
         headers = {
             "X-Tile-Level": str(level),
             "X-Tile-X": str(tile_x),
@@ -289,9 +479,70 @@ def api_tile_image(
             "X-Tile-Size": str(service.settings.images.frame_height),
             "X-Tile-Orientation": orientation,
         }
-        cache_ttl = int(getattr(service.settings.memory_cache, "ttl_seconds", 120) or 120)
-        headers["Cache-Control"] = f"public, max-age={cache_ttl}"
-        return Response(content=payload, media_type=_image_media_type(fmt), headers=headers)
+
+        def _render() -> tuple[Optional[Path], Optional[os.stat_result], bytes]:
+            if width is None and height is None and abs(scale - 1.0) < 1e-3:
+                tile_path = service.get_tile_file(
+                    surface=surface,
+                    seq_no=seq_no,
+                    view=view,
+                    level=level,
+                    tile_x=tile_x,
+                    tile_y=tile_y,
+                    orientation=orientation,
+                    fmt=fmt,
+                    viewer_id=resolved_viewer_id,
+                    prefetch=prefetch_payload,
+                )
+                if tile_path is not None:
+                    return tile_path, tile_path.stat(), b""
+            payload = service.get_tile(
+                surface=surface,
+                seq_no=seq_no,
+                view=view,
+                level=level,
+                tile_x=tile_x,
+                tile_y=tile_y,
+                orientation=orientation,
+                width=width,
+                height=height,
+                fmt=fmt,
+                viewer_id=resolved_viewer_id,
+                prefetch=prefetch_payload,
+            )
+            return None, None, _apply_scale(payload, scale, fmt, service)
+
+        # 预取参数与 viewer 相关，纳入 key，保证每个 viewer 的预取调度不被合并掉
+        key = (
+            "tile",
+            surface,
+            seq_no,
+            view,
+            level,
+            tile_x,
+            tile_y,
+            width,
+            height,
+            orientation,
+            scale,
+            fmt,
+            resolved_viewer_id,
+            prefetch,
+            prefetch_x,
+            prefetch_y,
+            prefetch_image_index,
+        )
+        tile_path, stat, payload = await _single_flight(key, _render)
+        if tile_path is not None and stat is not None:
+            # 磁盘缓存命中：FileResponse 走 sendfile 零拷贝发送，不把整张 JPEG 读入 Python 内存。
+            headers.update(_cache_headers(service, _file_etag(tile_path, stat), immutable=False))
+            if _etag_matches(request, headers["ETag"]):
+                return _not_modified(headers)
+            return FileResponse(tile_path, media_type=_image_media_type(fmt), headers=headers, stat_result=stat)
+        headers.update(_cache_headers(service, _content_etag(payload), immutable=False))
+        if _etag_matches(request, headers["ETag"]):
+            return _not_modified(headers)
+        return _ranged_response(request, payload, _image_media_type(fmt), headers)
     except FileNotFoundError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
     except ValueError as exc:
@@ -337,8 +588,9 @@ async def api_tile_preheat(
                     already_cached_count += 1
                     continue
                 
-                # 预热瓦片到缓存（不返回数据）
-                service.get_tile(
+                # 预热瓦片到缓存（不返回数据）；放到图像线程池，避免阻塞事件循环
+                await _run_image_work(
+                    service.get_tile,
                     surface=request.surface,
                     seq_no=request.seq_no,
                     view=request.view,
@@ -1,57 +1,62 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
 
-from fastapi import APIRouter, Depends, Query
+import orjson
+from fastapi import APIRouter, Depends, Query, Response
+from fastapi.responses import StreamingResponse
 
 from app.server.api.dependencies import get_steel_service
 from app.server.api.utils import grade_to_level
-from app.server.schemas import UiSteelItem, UiSteelListResponse
+from app.server.schemas import SteelRecord, UiSteelItem, UiSteelListResponse
 from app.server.services.steel_service import SteelService
 
 router = APIRouter(prefix="/api")
 
 
+def _to_ui_item(record: SteelRecord) -> UiSteelItem:
+    # SteelRecord 已经过校验，字段类型与 UiSteelItem 一致：model_construct 跳过逐条重复校验。
+    return UiSteelItem.model_construct(
+        seq_no=record.seq_no,
+        steel_no=record.steel_id,
+        steel_type=record.steel_type,
+        length=record.produced_length or record.ordered_length,
+        width=record.produced_width or record.ordered_width,
+        thickness=record.produced_thickness or record.ordered_thickness,
+        timestamp=record.detect_time,
+        level=grade_to_level(record.grade),
+        defect_count=record.defect_count,
+    )
+
+
 @router.get("/steels", response_model=UiSteelListResponse)
 def api_list_steels(
+    response: Response,
     limit: int = Query(20, ge=1, le=500),
     defect_only: bool = False,
     start_seq: Optional[int] = Query(default=None, description="Start seqNo (exclusive)"),
-    order: str = Query(default="desc", pattern="^(asc|desc)$"),
+    order: Literal["asc", "desc"] = Query(default="desc"),
     service: SteelService = Depends(get_steel_service),
 ):
     desc = order != "asc"
     base = service.list_recent(limit=limit, defect_only=defect_only, start_seq=start_seq, desc=desc)
-    steels: list[UiSteelItem] = []
-    for record in base.items:
-        length = record.produced_length or record.ordered_length
-        width = record.produced_width or record.ordered_width
-        thickness = record.produced_thickness or record.ordered_thickness
-        steels.append(
-            UiSteelItem(
-                seq_no=record.seq_no,
-                steel_no=record.steel_id,
-                steel_type=record.steel_type,
-                length=length,
-                width=width,
-                thickness=thickness,
-                timestamp=record.detect_time,
-                level=grade_to_level(record.grade),
-                defect_count=record.defect_count,
-            )
-    )
+    steels = [_to_ui_item(record) for record in base.items]
+    if not steels:
+        # 与 SteelService 一致：钢板可能尚未写入，空列表不进入响应缓存。
+        response.headers["Cache-Control"] = "no-store"
     return UiSteelListResponse(steels=steels, total=len(steels))
 
 
 @router.get("/steels/search", response_model=UiSteelListResponse)
 def api_search_steels(
+    response: Response,
     limit: int = Query(20, ge=1, le=500),
     seq_no: Optional[int] = Query(default=None, description="流水号精确匹配"),
     steel_no: Optional[str] = Query(default=None, description="钢板号模糊匹配"),
     date_from: Optional[datetime] = Query(default=None, description="起始时间（含）"),
     date_to: Optional[datetime] = Query(default=None, description="结束时间（含）"),
-    order: str = Query(default="desc", pattern="^(asc|desc)$"),
+    order: Literal["asc", "desc"] = Query(default="desc"),
     service: SteelService = Depends(get_steel_service),
 ):
     desc = order != "asc"
@@ -63,22 +68,26 @@ def api_search_steels(
         end=date_to,
         desc=desc,
     )
-    steels: list[UiSteelItem] = []
-    for record in base.items:
-        length = record.produced_length or record.ordered_length
-        width = record.produced_width or record.ordered_width
-        thickness = record.produced_thickness or record.ordered_thickness
-        steels.append(
-            UiSteelItem(
-                seq_no=record.seq_no,
-                steel_no=record.steel_id,
-                steel_type=record.steel_type,
-                length=length,
-                width=width,
-                thickness=thickness,
-                timestamp=record.detect_time,
-                level=grade_to_level(record.grade),
-                defect_count=record.defect_count,
-            )
-        )
+    steels = [_to_ui_item(record) for record in base.items]
+    if not steels:
+        # 与 SteelService 一致：钢板可能尚未写入，空列表不进入响应缓存。
+        response.headers["Cache-Control"] = "no-store"
     return UiSteelListResponse(steels=steels, total=len(steels))
+
+
+@router.get("/steels/date.ndjson")
+def api_export_steels_by_date(
+    date_from: datetime = Query(..., description="起始时间（含）"),
+    date_to: datetime = Query(..., description="结束时间（含）"),
+    service: SteelService = Depends(get_steel_service),
+):
+    """
+    按时间段导出钢板列表（NDJSON，每行一条）。分批查询、边查边写，
+    大时间窗口下内存占用恒定，首字节无需等待全部结果。
+    """
+
+    def _lines():
+        for batch in service.iter_by_date(date_from, date_to):
+            yield b"".join(orjson.dumps(_to_ui_item(record).model_dump()) + b"\n" for record in batch)
+
+    return StreamingResponse(_lines(), media_type="application/x-ndjson")
@@ -34,12 +34,14 @@ def _resolve_defect_class_file() -> Path:
     return DEFAULT_DEFECT_CLASS
 
 
+_GRADE_LEVELS = {1: "A", 2: "B", 3: "C", 4: "D"}
+
+
 def grade_to_level(grade: Optional[int] | None) -> str:
     """将内部整数等级映射为 A-D 等级，用于 Web UI."""
     if grade is None:
         return "D"
-    mapping = {1: "A", 2: "B", 3: "C", 4: "D"}
-    return mapping.get(int(grade), "D")
+    return _GRADE_LEVELS.get(int(grade), "D")
 
 
 def grade_to_severity(grade: Optional[int] | None) -> str:
@@ -83,6 +85,11 @@ def _defect_class_map() -> dict[int, str]:
     return mapping
 
 
+def defect_class_labels() -> dict[int, str]:
+    """返回 class_id -> 描述 的映射（已缓存），供逐行换算时在循环外取一次。"""
+    return _defect_class_map()
+
+
 def defect_class_label(class_id: Optional[int]) -> str:
     if class_id is None:
         return "未知缺陷"
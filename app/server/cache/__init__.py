@@ -1,4 +1,5 @@
 from .disk_image_cache import DiskImageCache
+from .response_cache import ResponseCacheMiddleware
 from .ttl_lru_cache import TtlLruCache
 
-__all__ = ["DiskImageCache", "TtlLruCache"]
+__all__ = ["DiskImageCache", "ResponseCacheMiddleware", "TtlLruCache"]
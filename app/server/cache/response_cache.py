@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from typing import Mapping
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .ttl_lru_cache import TtlLruCache
+
+# 超过该大小的响应体不缓存，避免少数超大列表占满内存。
+MAX_CACHED_BODY_BYTES = 1024 * 1024
+
+
+def _cacheable(start: Message) -> bool:
+    if start["status"] != 200:
+        return False
+    for name, value in start.get("headers") or ():
+        if name.lower() == b"cache-control" and b"no-store" in value.lower():
+            return False
+    return True
+
+
+class ResponseCacheMiddleware:
+    """
+    按路由缓存 GET JSON 响应的最终字节（状态码、响应头、响应体），命中时跳过
+    参数校验、模型构建与序列化。只缓存 200 且未分块的响应；路由可通过
+    Cache-Control: no-store 标记单个响应不缓存（例如尚未写入的钢板返回的空列表）。
+
+    ttl_by_path: 以 "/" 结尾的键按前缀匹配，其余按完整路径精确匹配，值为 TTL 秒数。
+    需要注册在 CORS 中间件之内（先 add_middleware），CORS 响应头按请求 Origin 生成，不能被缓存。
+    """
+
+    def __init__(self, app: ASGIApp, *, ttl_by_path: Mapping[str, int], max_items: int = 256) -> None:
+        self.app = app
+        self._exact: dict[str, TtlLruCache] = {}
+        self._prefixes: list[tuple[str, TtlLruCache]] = []
+        for path, ttl in ttl_by_path.items():
+            cache: TtlLruCache = TtlLruCache(max_items=max_items, ttl_seconds=ttl)
+            if path.endswith("/"):
+                self._prefixes.append((path, cache))
+            else:
+                self._exact[path] = cache
+
+    def _cache_for(self, path: str) -> TtlLruCache | None:
+        cache = self._exact.get(path)
+        if cache is not None:
+            return cache
+        for prefix, prefix_cache in self._prefixes:
+            if path.startswith(prefix):
+                return prefix_cache
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+        cache = self._cache_for(scope["path"])
+        if cache is None:
+            await self.app(scope, receive, send)
+            return
+
+        key = (scope["path"], scope.get("query_string", b""))
+        cached = cache.get(key)
+        if cached is not None:
+            status, headers, body = cached
+            await send({"type": "http.response.start", "status": status, "headers": headers})
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        start: Message | None = None
+        chunked = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start, chunked
+            if message["type"] == "http.response.start":
+                start = message
+            elif message["type"] == "http.response.body":
+                if message.get("more_body", False):
+                    # 分块响应只会看到最后一块，整体不缓存
+                    chunked = True
+                elif not chunked and start is not None and _cacheable(start):
+                    body = message.get("body", b"")
+                    if len(body) <= MAX_CACHED_BODY_BYTES:
+                        cache.put(key, (200, list(start.get("headers") or ()), body))
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
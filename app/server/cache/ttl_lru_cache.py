@@ -3,7 +3,7 @@ from __future__ import annotations
 import threading
 import time
 from collections import OrderedDict
-from typing import Generic, MutableMapping, TypeVar
+from typing import Callable, Generic, MutableMapping, Optional, TypeVar
 
 K = TypeVar("K")
 V = TypeVar("V")
@@ -12,6 +12,9 @@ V = TypeVar("V")
 class TtlLruCache(Generic[K, V]):
     """
     Lightweight thread-safe LRU cache with TTL eviction.
+
+    max_bytes: optional total size cap, measured with size_fn (len by default),
+    for caches holding encoded image bytes of very different sizes.
     """
 
     def __init__(
@@ -19,6 +22,8 @@ class TtlLruCache(Generic[K, V]):
         *,
         max_items: int = 128,
         ttl_seconds: int = 120,
+        max_bytes: Optional[int] = None,
+        size_fn: Callable[[V], int] = len,  # type: ignore[assignment]
         time_fn=time.monotonic,
     ):
         if max_items < 1:
@@ -27,6 +32,9 @@ class TtlLruCache(Generic[K, V]):
             raise ValueError("ttl_seconds must be >= 1")
         self._max_items = max_items
         self._ttl_seconds = ttl_seconds
+        self._max_bytes = max_bytes
+        self._size_fn = size_fn
+        self._total_bytes = 0
         self._time_fn = time_fn
         self._store: MutableMapping[K, tuple[float, V]] = OrderedDict()
         self._lock = threading.Lock()
@@ -39,23 +47,36 @@ class TtlLruCache(Generic[K, V]):
                 return None
             expires_at, value = entry
             if expires_at <= now:
-                self._store.pop(key, None)
+                self._pop(key)
                 return None
             self._store.move_to_end(key)
             return value
 
     def put(self, key: K, value: V) -> None:
         expires_at = self._time_fn() + float(self._ttl_seconds)
+        size = self._size_fn(value) if self._max_bytes is not None else 0
         with self._lock:
-            if key in self._store:
-                self._store.move_to_end(key)
+            self._pop(key)
+            # 超过总容量的值不缓存，但同键的旧值已经过时，仍需先移除
+            if self._max_bytes is not None and size > self._max_bytes:
+                return
             self._store[key] = (expires_at, value)
-            if len(self._store) > self._max_items:
-                self._store.popitem(last=False)
+            self._total_bytes += size
+            while len(self._store) > self._max_items or (
+                self._max_bytes is not None and self._total_bytes > self._max_bytes
+            ):
+                oldest = next(iter(self._store))
+                self._pop(oldest)
+
+    def _pop(self, key: K) -> None:
+        entry = self._store.pop(key, None)
+        if entry is not None and self._max_bytes is not None:
+            self._total_bytes -= self._size_fn(entry[1])
 
     def clear(self) -> None:
         with self._lock:
             self._store.clear()
+            self._total_bytes = 0
 
     def __len__(self) -> int:
         with self._lock:
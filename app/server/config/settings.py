@@ -43,6 +43,14 @@ class DatabaseSettings(BaseModel):
         default=None,
         description="Directory containing SQLite backups named like {database}.db",
     )
+    pool_size: int = Field(default=20, ge=1)
+    max_overflow: int = Field(default=30, ge=0)
+    pool_timeout: int = Field(default=10, ge=1, description="Seconds to wait for a pooled connection.")
+    pool_recycle: int = Field(default=1800, description="Recycle pooled connections after N seconds (-1 disables).")
+    pool_pre_ping: bool = Field(default=False, description="Ping on every checkout; pool_recycle already covers idle timeouts.")
+    query_cache_size: int = Field(
+        default=500, ge=0, description="SQLAlchemy compiled-statement cache entries per engine (0 disables)."
+    )
 
     @property
     def resolved_port(self) -> int:
@@ -295,6 +303,11 @@ def ensure_config_file(explicit_path: str | Path | None = None) -> Path:
 class MemoryCacheSettings(BaseModel):
     max_frames: int = Field(default=64, ge=-1)
     max_tiles: int = Field(default=256, ge=-1)
+    max_tile_bytes: int = Field(
+        default=256 * 1024 * 1024,
+        ge=-1,
+        description="瓦片内存缓存的总字节上限，-1 表示不限制（仍受 max_tiles 约束）",
+    )
     max_mosaics: int = Field(default=8, ge=-1)
     max_defect_crops: int = Field(default=256, ge=-1)
     ttl_seconds: int = Field(default=120, ge=1)
@@ -1,26 +1,30 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import logging
+import mimetypes
 import os
 import json
-import threading
+import re
 import time
+from contextlib import asynccontextmanager, suppress
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
-from typing import Any
+from typing import Any, TypedDict, cast
 
-from fastapi import APIRouter, FastAPI, HTTPException
+import orjson
+from fastapi import APIRouter, Body, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.responses import FileResponse, ORJSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers
+from starlette.staticfiles import NotModifiedResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from app.server.api import admin
-from app.server.test_model import router as test_model_router
-from app.server.net_table import load_map_payload, save_map_payload, resolve_net_table_dir
-from app.server.utils.speed_test import make_speed_test_response
-from app.server.status_service import get_status_service
+from app.server.net_table import CURRENT_ROOT, load_map_payload, save_map_payload, resolve_net_table_dir
 
 logger = logging.getLogger(__name__)
 REPO_ROOT = Path(__file__).resolve().parents[2]
@@ -34,19 +38,116 @@ DEFAULT_UI_BUILD_DIR = (
     / "WebAssembly_Qt_6_10_0_multi_threaded-MinSizeRel"
 )
 UI_BUILD_DIR = Path(os.getenv(UI_BUILD_ENV_KEY, DEFAULT_UI_BUILD_DIR))
+API_LIST_CACHE_TTL_SECONDS = 0.5
+MONITOR_INTERVAL_SECONDS = 5.0
+DISK_REFRESH_SECONDS = 120.0
+PARTITION_REFRESH_SECONDS = 600.0
+MOUNTS_PATH = "/proc/mounts"
+# /status/simple 选择规则：error > running > 其他；同级时控制中心优先。
+_STATE_RANK = {"error": 2, "running": 1}
+CONTROL_SERVICE_NAME = "image_generate"
+
+
+_COOP_COEP_HEADERS = (
+    (b"cross-origin-opener-policy", b"same-origin"),
+    (b"cross-origin-embedder-policy", b"require-corp"),
+    (b"cross-origin-resource-policy", b"same-origin"),
+)
+_COOP_COEP_HEADER_NAMES = frozenset(name for name, _ in _COOP_COEP_HEADERS)
+
+
+def _is_ui_request(scope: Scope) -> bool:
+    if scope["type"] != "http":
+        return False
+    raw = scope.get("raw_path") or scope.get("path", "").encode("latin-1")
+    return raw == b"/" or raw.startswith(b"/ui")
 
 
-class CoopCoepMiddleware(BaseHTTPMiddleware):
+class CoopCoepMiddleware:
     """Ensure /ui responses can use SharedArrayBuffer by enabling cross-origin isolation."""
 
-    async def dispatch(self, request, call_next):
-        response = await call_next(request)
-        path = request.url.path or ""
-        if path == "/" or path.startswith("/ui"):
-            response.headers.setdefault("Cross-Origin-Opener-Policy", "same-origin")
-            response.headers.setdefault("Cross-Origin-Embedder-Policy", "require-corp")
-            response.headers.setdefault("Cross-Origin-Resource-Policy", "same-origin")
-        return response
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if not _is_ui_request(scope):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = message.get("headers")
+                if not isinstance(headers, list):
+                    headers = message["headers"] = list(headers or ())
+                existing = frozenset(name.lower() for name, _ in headers)
+                if existing.isdisjoint(_COOP_COEP_HEADER_NAMES):
+                    headers.extend(_COOP_COEP_HEADERS)
+                else:
+                    headers.extend(h for h in _COOP_COEP_HEADERS if h[0] not in existing)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+class ApiCorsMiddleware:
+    """CORS 只作用于 API：/ui 静态资源与页面同源加载，直接跳过 CORS 处理。"""
+
+    def __init__(self, app: ASGIApp, **cors_options: Any) -> None:
+        self.app = app
+        self.cors = CORSMiddleware(app, **cors_options)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if _is_ui_request(scope):
+            await self.app(scope, receive, send)
+            return
+        await self.cors(scope, receive, send)
+
+
+@lru_cache(maxsize=1)
+def _cached_net_table_dir(mtime_ns: int) -> Path:
+    return resolve_net_table_dir()
+
+
+def _net_table_dir() -> Path:
+    """按 configs/current 目录的 mtime 缓存 resolve_net_table_dir() 的结果。"""
+    try:
+        mtime_ns = os.stat(CURRENT_ROOT).st_mtime_ns
+    except OSError:
+        return resolve_net_table_dir()
+    return _cached_net_table_dir(mtime_ns)
+
+
+_EMPTY_SERVER_JSON = json.dumps(
+    {"database": {}, "images": {}, "cache": {}},
+    ensure_ascii=False,
+    indent=2,
+).encode("utf-8")
+
+
+def _write_if_absent(path: Path, content: bytes) -> None:
+    # O_EXCL 保证只在文件不存在时创建，省去 exists() 检查及其竞态。
+    try:
+        fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, "O_BINARY", 0), 0o644)
+    except FileExistsError:
+        return
+    with os.fdopen(fd, "wb") as handle:
+        handle.write(content)
+
+
+def _encode_with_etag(content: Any) -> tuple[bytes, str]:
+    body = orjson.dumps(content)
+    return body, f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+
+def _etag_response(request: Request, body: bytes, etag: str) -> Response:
+    """轮询接口：If-None-Match 命中时返回 304，省去响应体传输。"""
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if etag in candidates or "*" in candidates:
+            return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 def _resolve_ui_index(ui_dir: Path) -> Path | None:
@@ -57,19 +158,125 @@ def _resolve_ui_index(ui_dir: Path) -> Path | None:
     return None
 
 
+# 文件名中带内容哈希（如 app.3f9c2a1b.js）的构建产物可长期缓存；
+# Qt WASM 默认产物名不带哈希，只能 no-cache + ETag/Last-Modified 协商。
+_HASHED_ASSET_RE = re.compile(r"[.\-_][0-9a-f]{8,}\.", re.IGNORECASE)
+UI_INDEX_CACHE_CONTROL = "public, max-age=300"
+
+
+# 构建后预压缩的同名旁路文件（如 DefectWebUi.wasm.br / .gz，由 app/server/utils/precompress_ui.py 生成），
+# 按客户端 Accept-Encoding 优先选择 br。
+_PRECOMPRESSED_SUFFIXES = ((b"br", ".br"), (b"gzip", ".gz"))
+
+
+def _accepted_encodings(scope: Scope) -> frozenset[bytes]:
+    for name, value in scope.get("headers") or ():
+        if name == b"accept-encoding":
+            accepted = set()
+            for item in value.split(b","):
+                coding, _, params = item.partition(b";")
+                params = params.strip()
+                if params.startswith(b"q="):
+                    try:
+                        if float(params[2:]) <= 0:
+                            continue
+                    except ValueError:
+                        pass
+                accepted.add(coding.strip().lower())
+            return frozenset(accepted)
+    return frozenset()
+
+
+class UiStaticFiles(StaticFiles):
+    def _precompressed_response(self, full_path, stat_result, scope, status_code):
+        accepted = _accepted_encodings(scope)
+        if not accepted:
+            return None
+        for coding, suffix in _PRECOMPRESSED_SUFFIXES:
+            if coding not in accepted:
+                continue
+            try:
+                sidecar_stat = os.stat(f"{full_path}{suffix}")
+            except OSError:
+                continue
+            # 比原文件旧的压缩文件视为过期（重新构建后未重新压缩），回退到原文件
+            if sidecar_stat.st_mtime < stat_result.st_mtime:
+                continue
+            media_type, _ = mimetypes.guess_type(str(full_path))
+            response = FileResponse(
+                f"{full_path}{suffix}",
+                status_code=status_code,
+                stat_result=sidecar_stat,
+                media_type=media_type or "application/octet-stream",
+                headers={"Content-Encoding": coding.decode("ascii"), "Vary": "Accept-Encoding"},
+            )
+            # 与 StaticFiles 原逻辑一致：协商缓存命中（ETag/Last-Modified 取自压缩文件）时返回 304
+            if self.is_not_modified(response.headers, Headers(scope=scope)):
+                return NotModifiedResponse(response.headers)
+            return response
+        return None
+
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        response = None
+        if status_code == 200:
+            response = self._precompressed_response(full_path, stat_result, scope, status_code)
+        if response is None:
+            response = super().file_response(full_path, stat_result, scope, status_code)
+        if _HASHED_ASSET_RE.search(os.path.basename(full_path)):
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        else:
+            response.headers.setdefault("Cache-Control", "no-cache")
+        return response
+
+
+class _UiIndex:
+    """首页 HTML 只有几 KB：常驻内存，按 mtime 判断是否需要重新读取（WASM 重新构建后生效）。"""
+
+    def __init__(self, ui_dir: Path) -> None:
+        self._ui_dir = ui_dir
+        self._index_path: Path | None = None
+        self._key: tuple[Path, int] | None = None
+        self._body = b""
+
+    def _current_key(self) -> tuple[Path, int] | None:
+        # 首页路径只解析一次，之后每次请求只做一次 stat；文件消失时再重新解析。
+        if self._index_path is not None:
+            with suppress(OSError):
+                return self._index_path, os.stat(self._index_path).st_mtime_ns
+        self._index_path = _resolve_ui_index(self._ui_dir)
+        if self._index_path is None:
+            return None
+        try:
+            return self._index_path, os.stat(self._index_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def load(self) -> bytes | None:
+        key = self._current_key()
+        if key is None:
+            return None
+        if key != self._key:
+            self._body = key[0].read_bytes()
+            self._key = key
+        return self._body
+
+
 def _mount_ui(app: FastAPI) -> None:
     app.add_middleware(CoopCoepMiddleware)
     if UI_BUILD_DIR.exists():
         app.mount(
             "/ui",
-            StaticFiles(directory=str(UI_BUILD_DIR), html=True),
+            # 目录存在性已在上面判断，check_dir=False 省去 StaticFiles 构造时的重复检查
+            UiStaticFiles(directory=str(UI_BUILD_DIR), html=True, check_dir=False),
             name="defect-web-ui",
         )
+        ui_index = _UiIndex(UI_BUILD_DIR)
+        ui_index.load()
 
         @app.get("/", include_in_schema=False)
         async def serve_ui_root():
-            index_path = _resolve_ui_index(UI_BUILD_DIR)
-            if not index_path:
+            body = ui_index.load()
+            if body is None:
                 raise HTTPException(
                     status_code=404,
                     detail=(
@@ -77,7 +284,11 @@ def _mount_ui(app: FastAPI) -> None:
                         f"{UI_BUILD_DIR}. Check your WASM build output."
                     ),
                 )
-            return FileResponse(index_path)
+            return Response(
+                content=body,
+                media_type="text/html",
+                headers={"Cache-Control": UI_INDEX_CACHE_CONTROL},
+            )
     else:
         logger.warning(
             "Defect Web UI build directory %s not found. "
@@ -91,7 +302,7 @@ class ProcessManager:
     def get_api_list(self) -> list[dict[str, Any]]:  # pragma: no cover - interface
         raise NotImplementedError
 
-    def update_api_status(self, status: dict[str, Any]) -> None:  # pragma: no cover - interface
+    def update_api_status(self, status: ApiStatusPayload) -> None:  # pragma: no cover - interface
         raise NotImplementedError
 
     def restart_line(self, line: str) -> bool:  # pragma: no cover - interface
@@ -125,25 +336,27 @@ class LineConfigPayload(BaseModel):
     lines: list[dict[str, Any]]
 
 
-class ApiStatusPayload(BaseModel):
+class ApiStatusPayload(TypedDict, total=False):
+    """产线 API 心跳上报结构；内部接口，仅校验 key，其余字段由 ProcessManager 自行容错解析。"""
+
     key: str
-    name: str | None = None
-    kind: str | None = None
-    host: str | None = None
-    port: int | None = None
-    pid: int | None = None
-    online: bool | None = None
-    latest_timestamp: datetime | None = None
-    latest_age_seconds: int | None = None
-    services: list[dict[str, Any]] | None = None
-    logs: list[dict[str, Any]] | None = None
-    service_versions: dict[str, int] | None = None
-    service_log_cursor: dict[str, int] | None = None
+    name: str | None
+    kind: str | None
+    host: str | None
+    port: int | None
+    pid: int | None
+    online: bool | None
+    latest_timestamp: str | None
+    latest_age_seconds: int | None
+    services: list[dict[str, Any]] | None
+    logs: list[dict[str, Any]] | None
+    service_versions: dict[str, int] | None
+    service_log_cursor: dict[str, int] | None
 
 
 class SystemMonitor:
     def __init__(self) -> None:
-        self._lock = threading.Lock()
+        # 每轮采样后整体替换 metrics 引用；已发布的字典不再修改。
         self._metrics: dict[str, Any] = {
             "cpu_percent": None,
             "memory": None,
@@ -151,65 +364,127 @@ class SystemMonitor:
             "updated_at": None,
             "disk_updated_at": None,
         }
-        self._stop = threading.Event()
-        self._thread = threading.Thread(target=self._loop, daemon=True)
-        self._thread.start()
-
-    def _loop(self) -> None:
-        last_disk = 0.0
-        while not self._stop.is_set():
-            now = time.time()
+        self._partitions_cache: list[str] | None = None
+        self._partitions_mtime: int | None = None
+        self._partitions_checked = 0.0
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._loop())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+
+    def _mountpoints(self, psutil: Any, now: float) -> list[str]:
+        # disk_partitions() 每次都会重新解析挂载表；仅在挂载表变化或超过刷新周期时重新枚举。
+        try:
+            mtime: int | None = os.stat(MOUNTS_PATH).st_mtime_ns
+        except OSError:
+            mtime = None
+        if (
+            self._partitions_cache is None
+            or mtime != self._partitions_mtime
+            or now - self._partitions_checked >= PARTITION_REFRESH_SECONDS
+        ):
+            self._partitions_cache = [part.mountpoint for part in psutil.disk_partitions(all=False)]
+            self._partitions_mtime = mtime
+            self._partitions_checked = now
+        return self._partitions_cache
+
+    def _sample(self, psutil: Any, now: float, include_disks: bool) -> dict[str, Any]:
+        metrics: dict[str, Any] = {}
+        try:
+            metrics["cpu_percent"] = psutil.cpu_percent(interval=None)
+            vm = psutil.virtual_memory()
+            metrics["memory"] = {
+                "total": vm.total,
+                "used": vm.used,
+                "percent": vm.percent,
+            }
+            if include_disks:
+                disks = []
+                for mountpoint in self._mountpoints(psutil, now):
+                    try:
+                        usage = psutil.disk_usage(mountpoint)
+                    except Exception:
+                        continue
+                    disks.append(
+                        {
+                            "mountpoint": mountpoint,
+                            "total": usage.total,
+                            "used": usage.used,
+                            "percent": usage.percent,
+                        }
+                    )
+                metrics["disks"] = disks
+                metrics["disk_updated_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        except Exception:
+            metrics["notes"] = ["psutil_not_available"]
+        return metrics
+
+    async def _loop(self) -> None:
+        try:
+            import psutil  # type: ignore
+        except Exception:
+            psutil = None
+        last_disk: float | None = None
+        while True:
+            now = time.monotonic()
             metrics: dict[str, Any] = {}
-            try:
-                import psutil  # type: ignore
-
-                metrics["cpu_percent"] = psutil.cpu_percent(interval=None)
-                vm = psutil.virtual_memory()
-                metrics["memory"] = {
-                    "total": vm.total,
-                    "used": vm.used,
-                    "percent": vm.percent,
-                }
-                if now - last_disk >= 120:
-                    disks = []
-                    for part in psutil.disk_partitions(all=False):
-                        try:
-                            usage = psutil.disk_usage(part.mountpoint)
-                        except Exception:
-                            continue
-                        disks.append(
-                            {
-                                "mountpoint": part.mountpoint,
-                                "total": usage.total,
-                                "used": usage.used,
-                                "percent": usage.percent,
-                            }
-                        )
-                    metrics["disks"] = disks
-                    metrics["disk_updated_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    last_disk = now
-            except Exception:
+            if psutil is None:
                 metrics["notes"] = ["psutil_not_available"]
-            metrics["updated_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            with self._lock:
-                if metrics.get("cpu_percent") is not None:
-                    self._metrics["cpu_percent"] = metrics.get("cpu_percent")
-                if metrics.get("memory") is not None:
-                    self._metrics["memory"] = metrics.get("memory")
-                if metrics.get("disks") is not None:
-                    self._metrics["disks"] = metrics.get("disks", [])
+            else:
+                include_disks = last_disk is None or now - last_disk >= DISK_REFRESH_SECONDS
+                try:
+                    metrics = await asyncio.to_thread(self._sample, psutil, now, include_disks)
+                except Exception:
+                    logger.exception("Failed to sample system metrics.")
                 if metrics.get("disk_updated_at"):
-                    self._metrics["disk_updated_at"] = metrics.get("disk_updated_at")
-                self._metrics["updated_at"] = metrics.get("updated_at")
-            self._stop.wait(5)
+                    last_disk = now
+            metrics["updated_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            # 整体替换字典引用：读取方无需加锁即可拿到一致的快照。
+            merged = dict(self._metrics)
+            if metrics.get("cpu_percent") is not None:
+                merged["cpu_percent"] = metrics.get("cpu_percent")
+            if metrics.get("memory") is not None:
+                merged["memory"] = metrics.get("memory")
+            if metrics.get("disks") is not None:
+                merged["disks"] = metrics.get("disks", [])
+            if metrics.get("disk_updated_at"):
+                merged["disk_updated_at"] = metrics.get("disk_updated_at")
+            merged["updated_at"] = metrics.get("updated_at")
+            self._metrics = merged
+            elapsed = time.monotonic() - now
+            await asyncio.sleep(max(0.0, MONITOR_INTERVAL_SECONDS - elapsed))
 
     def snapshot(self) -> dict[str, Any]:
-        with self._lock:
-            return dict(self._metrics)
+        """返回最新指标的只读引用，调用方不得修改。"""
+        return self._metrics
 
 
 def create_app(manager: ProcessManager) -> FastAPI:
-    app = FastAPI(title="Config Center", version="0.1.0")
+    monitor = SystemMonitor()
+
+    @asynccontextmanager
+    async def lifespan(_app: FastAPI):
+        monitor.start()
+        try:
+            yield
+        finally:
+            await monitor.stop()
+
+    app = FastAPI(
+        title="Config Center",
+        version="0.1.0",
+        default_response_class=ORJSONResponse,
+        lifespan=lifespan,
+    )
     _cors_env = os.getenv("CORS_ALLOW_ORIGINS", "*")
     _cors_origins = [origin.strip() for origin in _cors_env.split(",") if origin.strip()]
     if _cors_env != "*":
@@ -217,52 +492,67 @@ def create_app(manager: ProcessManager) -> FastAPI:
             if origin not in _cors_origins:
                 _cors_origins.append(origin)
     app.add_middleware(
-        CORSMiddleware,
+        ApiCorsMiddleware,
         allow_origins=_cors_origins if _cors_origins else ["*"],
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
     )
     _mount_ui(app)
-    monitor = SystemMonitor()
     router = APIRouter(prefix="/config")
+    # UI 以 1-5 Hz 轮询 api_list，短 TTL 缓存可避免反复遍历进程状态。
+    api_list_cache: dict[str, Any] = {"ts": 0.0, "value": None}
 
     @router.get("/api_list")
-    def api_list() -> dict[str, Any]:
-        return {"items": manager.get_api_list()}
+    def api_list(request: Request) -> Response:
+        now = time.monotonic()
+        cached = api_list_cache["value"]
+        if cached is None or now - api_list_cache["ts"] >= API_LIST_CACHE_TTL_SECONDS:
+            cached = _encode_with_etag({"items": manager.get_api_list()})
+            api_list_cache["value"] = cached
+            api_list_cache["ts"] = now
+        return _etag_response(request, *cached)
 
     @router.post("/api_status")
-    def api_status(payload: ApiStatusPayload) -> dict[str, Any]:
-        manager.update_api_status(payload.dict())
+    def api_status(payload: dict[str, Any] = Body(...)) -> dict[str, Any]:
+        if not isinstance(payload.get("key"), str) or not payload["key"]:
+            raise HTTPException(status_code=422, detail="key is required")
+        manager.update_api_status(cast(ApiStatusPayload, payload))
         return {"status": "ok"}
 
     @router.get("/speed_test")
     def speed_test(chunk_kb: int = 256, total_mb: int = 64) -> StreamingResponse:
+        from app.server.utils.speed_test import make_speed_test_response
+
         return make_speed_test_response(chunk_kb=chunk_kb, total_mb=total_mb)
 
     @router.post("/restart")
     def restart_all() -> dict[str, Any]:
         restarted = manager.restart_all()
+        api_list_cache["value"] = None
         return {"restarted": restarted}
 
     @router.post("/restart/{line}")
     def restart_line(line: str) -> dict[str, Any]:
         ok = manager.restart_line(line)
+        api_list_cache["value"] = None
         if not ok:
             raise HTTPException(status_code=404, detail=f"Line '{line}' not found")
         return {"restarted": line}
 
     @router.get("/lines")
-    def get_lines() -> dict[str, Any]:
+    def get_lines() -> Response:
         root, payload = load_map_payload()
-        return {
-            "root": str(root),
-            "views": payload.get("views") or {},
-            "lines": payload.get("lines") or [],
-        }
+        return ORJSONResponse(
+            content={
+                "root": str(root),
+                "views": payload.get("views") or {},
+                "lines": payload.get("lines") or [],
+            }
+        )
 
     @router.get("/status")
-    def config_status(line_key: str | None = None, kind: str | None = None) -> dict[str, Any]:
+    def config_status(request: Request, line_key: str | None = None, kind: str | None = None) -> Response:
         items: list[dict[str, Any]] = []
         try:
             items = manager.get_status_items(line_key=line_key, kind=kind)
@@ -270,10 +560,11 @@ def create_app(manager: ProcessManager) -> FastAPI:
             logger.exception("Failed to build status items.")
         control_item = None
         try:
+            from app.server.status_service import get_status_service
+
             status_service = get_status_service()
-            control_services = [
-                item for item in status_service.list_services() if item.get("name") == "image_generate"
-            ]
+            control_service = status_service.get_service(CONTROL_SERVICE_NAME)
+            control_services = [control_service] if control_service else []
             control_item = {
                 "key": "__control__",
                 "name": "控制中心",
@@ -286,41 +577,40 @@ def create_app(manager: ProcessManager) -> FastAPI:
             logger.exception("Failed to build control center status.")
         if control_item:
             items = [control_item, *items]
-        return {"items": items, "system_monitor": monitor.snapshot()}
+        body, etag = _encode_with_etag({"items": items, "system_monitor": monitor.snapshot()})
+        return _etag_response(request, body, etag)
 
     @router.get("/status/simple")
-    def config_status_simple(line_key: str | None = None, kind: str | None = None) -> dict[str, Any]:
+    def config_status_simple(line_key: str | None = None, kind: str | None = None) -> Response:
         item = None
         try:
+            from app.server.status_service import get_status_service
+
             status_service = get_status_service()
-            control_services = [
-                item for item in status_service.list_services() if item.get("name") == "image_generate"
-            ]
+            control_service = status_service.get_service(CONTROL_SERVICE_NAME)
             control_simple = None
-            if control_services:
+            if control_service:
                 control_simple = {
-                    "state": control_services[0].get("state"),
-                    "message": control_services[0].get("message"),
-                    "service": control_services[0].get("name"),
-                    "label": control_services[0].get("label"),
-                    "priority": control_services[0].get("priority"),
-                    "data": control_services[0].get("data") or {},
-                    "updated_at": control_services[0].get("updated_at"),
+                    "state": control_service.get("state"),
+                    "message": control_service.get("message"),
+                    "service": control_service.get("name"),
+                    "label": control_service.get("label"),
+                    "priority": control_service.get("priority"),
+                    "data": control_service.get("data") or {},
+                    "updated_at": control_service.get("updated_at"),
                 }
             api_simple = manager.get_simple_status(line_key=line_key, kind=kind)
-            if control_simple and str(control_simple.get("state") or "").lower() == "error":
-                item = control_simple
-                item["key"] = "__control__"
-            elif api_simple and str(api_simple.get("state") or "").lower() == "error":
-                item = api_simple
-            elif control_simple and str(control_simple.get("state") or "").lower() == "running":
+            # 状态在写入时已归一化为小写，这里只做整数比较。
+            control_rank = _STATE_RANK.get(control_simple.get("state"), 0) if control_simple else 0
+            api_rank = _STATE_RANK.get(api_simple.get("state"), 0) if api_simple else 0
+            if control_simple and control_rank and control_rank >= api_rank:
                 item = control_simple
                 item["key"] = "__control__"
             else:
                 item = api_simple or control_simple
         except Exception:
             logger.exception("Failed to build simple status.")
-        return {"item": item, "system_monitor": monitor.snapshot()}
+        return ORJSONResponse(content={"item": item, "system_monitor": monitor.snapshot()})
 
     @router.get("/status/{line_key}/{kind}/log")
     def config_status_log(
@@ -329,17 +619,25 @@ def create_app(manager: ProcessManager) -> FastAPI:
         service: str | None = None,
         cursor: int = 0,
         limit: int = 200,
-    ) -> dict[str, Any]:
+    ) -> Response:
         name = service or "all"
         if line_key == "__control__":
+            from app.server.status_service import get_status_service
+
             status_service = get_status_service()
-            return status_service.get_logs(name, cursor=cursor, limit=limit)
-        return manager.get_service_logs(line_key=line_key, kind=kind, service=name, cursor=cursor, limit=limit)
+            return ORJSONResponse(content=status_service.get_logs(name, cursor=cursor, limit=limit))
+        return ORJSONResponse(
+            content=manager.get_service_logs(
+                line_key=line_key, kind=kind, service=name, cursor=cursor, limit=limit
+            )
+        )
 
     @router.post("/status/{line_key}/{kind}/log/clear")
     def config_status_log_clear(line_key: str, kind: str, service: str | None = None) -> dict[str, Any]:
         name = service or "all"
         if line_key == "__control__":
+            from app.server.status_service import get_status_service
+
             status_service = get_status_service()
             status_service.clear_logs(name)
         else:
@@ -362,13 +660,17 @@ def create_app(manager: ProcessManager) -> FastAPI:
         if isinstance(current_meta, dict) and current_meta:
             merged["meta"] = current_meta
         map_path = save_map_payload(merged)
-        generated_root = resolve_net_table_dir() / "generated"
+        generated_root = _net_table_dir() / "generated"
+        # 每次都确认一次（单次 mkdir 系统调用）：运行期间 generated/ 被删除时下方 scandir 不会失败。
         generated_root.mkdir(parents=True, exist_ok=True)
         old_by_name = {
             str(item.get("name") or ""): str(item.get("key") or item.get("name") or "")
             for item in current_lines
             if isinstance(item, dict)
         }
+        view_keys = list(current_views.keys()) if isinstance(current_views, dict) and current_views else ["2D"]
+        line_keys: list[str] = []
+        renames: list[tuple[str, str]] = []
         for line in payload.lines:
             if not isinstance(line, dict):
                 continue
@@ -378,26 +680,32 @@ def create_app(manager: ProcessManager) -> FastAPI:
                 continue
             prev_key = old_by_name.get(name)
             if prev_key and prev_key != key:
-                old_path = generated_root / prev_key
-                new_path = generated_root / key
-                if old_path.exists() and not new_path.exists():
-                    old_path.rename(new_path)
-            view_keys = list(current_views.keys()) if isinstance(current_views, dict) and current_views else ["2D"]
-            for view in view_keys:
-                target_dir = generated_root / key / view
+                renames.append((prev_key, key))
+            line_keys.append(key)
+        if renames:
+            # 一次 scandir 取得现有目录名，代替每条产线两次 exists()。
+            with os.scandir(generated_root) as entries:
+                existing_dirs = {entry.name for entry in entries if entry.is_dir()}
+            for prev_key, key in renames:
+                if prev_key in existing_dirs and key not in existing_dirs:
+                    os.rename(generated_root / prev_key, generated_root / key)
+                    existing_dirs.discard(prev_key)
+                    existing_dirs.add(key)
+        # 先收集并去重全部目标目录，再按深度由浅到深创建，避免逐个 mkdir(parents=True) 的重复 stat。
+        target_dirs = {generated_root / key / view for key in line_keys for view in view_keys}
+        for target_dir in sorted(target_dirs, key=lambda path: len(path.parts)):
+            try:
+                target_dir.mkdir(exist_ok=True)
+            except FileNotFoundError:
                 target_dir.mkdir(parents=True, exist_ok=True)
-                override_path = target_dir / "server.json"
-                if not override_path.exists():
-                    override_path.write_text(
-                        json.dumps(
-                            {"database": {}, "images": {}, "cache": {}},
-                            ensure_ascii=False,
-                            indent=2,
-                        ),
-                        encoding="utf-8",
-                    )
+        for target_dir in target_dirs:
+            _write_if_absent(target_dir / "server.json", _EMPTY_SERVER_JSON)
         return {"path": str(map_path), "lines": merged.get("lines") or []}
 
+    # admin / test_model 依赖较重，延迟到 create_app 时再导入，缩短模块冷启动时间。
+    from app.server.api import admin
+    from app.server.test_model import router as test_model_router
+
     app.include_router(router)
     app.include_router(admin.router, prefix="/config")
     app.include_router(test_model_router)
@@ -1,50 +1,132 @@
 from __future__ import annotations
 
-from __future__ import annotations
-
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Optional
+from functools import lru_cache
+from typing import Iterable, Iterator, Optional
 from urllib.parse import quote_plus
 
-from sqlalchemy import create_engine, text
+import orjson
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
 from .config.settings import DatabaseSettings, ServerSettings
 
 
-def _build_url(settings: DatabaseSettings, db_name: str) -> str:
-    drive = settings.drive.lower()
-    user = quote_plus(settings.user)
-    password = quote_plus(settings.password)
-    host = settings.host
-    port = settings.resolved_port
-    charset = settings.charset
-
+@lru_cache(maxsize=8)
+def _server_url_parts(drive: str, user: str, password: str, host: str, port: int, charset: str) -> tuple[str, str]:
+    """返回 (前缀, 后缀)：URL = 前缀 + 库名 + 后缀；quote_plus 只在凭据变化时执行一次。"""
+    prefix = f"{quote_plus(user)}:{quote_plus(password)}@{host}:{port}/"
     if drive == "mysql":
-        return f"mysql+pymysql://{user}:{password}@{host}:{port}/{db_name}?charset={charset}"
+        return f"mysql+pymysql://{prefix}", f"?charset={charset}"
     if drive == "sqlserver":
         # Using pymssql driver string
-        return f"mssql+pymssql://{user}:{password}@{host}:{port}/{db_name}"
-    if drive == "sqlite":
+        return f"mssql+pymssql://{prefix}", ""
+    raise ValueError(f"Unsupported database driver: {drive}")
+
+
+def _url_parts(settings: DatabaseSettings) -> tuple[str, str]:
+    return _server_url_parts(
+        settings.drive.lower(),
+        settings.user,
+        settings.password,
+        settings.host,
+        settings.resolved_port,
+        settings.charset,
+    )
+
+
+def _build_url(settings: DatabaseSettings, db_name: str) -> str:
+    if settings.drive.lower() == "sqlite":
         if not settings.sqlite_dir:
             raise ValueError("sqlite_dir must be provided when drive=sqlite")
         sqlite_path = (settings.sqlite_dir / f"{db_name}.db").resolve()
         # SQLAlchemy expects forward slashes in SQLite URLs on Windows.
         return f"sqlite+pysqlite:///{sqlite_path.as_posix()}"
-    raise ValueError(f"Unsupported database driver: {drive}")
-
-
-def _create_engine(url: str):
-    connect_args = {}
+    prefix, suffix = _url_parts(settings)
+    return prefix + db_name + suffix
+
+
+# 测试模式（drive=sqlite）下的连接参数：WAL 让读不阻塞写，synchronous=NORMAL 省去每次提交的 fsync。
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
+
+
+def _apply_sqlite_pragmas(dbapi_conn, _connection_record) -> None:
+    cursor = dbapi_conn.cursor()
+    try:
+        for pragma in _SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+def _json_serializer(value) -> str:
+    # JSON 列（如 defect_annotation.export_payload）用 orjson 编解码，比标准库 json 快数倍。
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+
+def _create_engine(url: str, settings: Optional[DatabaseSettings] = None):
+    options = {
+        "pool_pre_ping": settings.pool_pre_ping if settings is not None else True,
+        "query_cache_size": settings.query_cache_size if settings is not None else 500,
+        "future": True,
+        "json_serializer": _json_serializer,
+        "json_deserializer": orjson.loads,
+    }
     if url.startswith("sqlite"):
         # FastAPI may use threadpool workers; allow SQLite connections across threads.
-        connect_args = {"check_same_thread": False}
-    return create_engine(url, pool_pre_ping=True, future=True, connect_args=connect_args)
+        # 本地文件库不存在连接被服务端断开的问题，无需 pre-ping。
+        options["pool_pre_ping"] = False
+        engine = create_engine(url, connect_args={"check_same_thread": False}, **options)
+        event.listen(engine, "connect", _apply_sqlite_pragmas)
+        return engine
+    if settings is not None:
+        # 默认 QueuePool 上限 5+10，三套库在线程池并发下容易 "QueuePool limit reached"。
+        options.update(
+            pool_size=settings.pool_size,
+            max_overflow=settings.max_overflow,
+            pool_timeout=settings.pool_timeout,
+            pool_recycle=settings.pool_recycle,
+            # LIFO 复用最近归还的连接：热连接保持活跃，突发后多余的 overflow 连接闲置并按 recycle 释放。
+            pool_use_lifo=True,
+        )
+    return create_engine(url, **options)
+
+
+def _build_server_url(settings: DatabaseSettings) -> str:
+    """实例级 URL（不含业务库名），只用于建库等库外 DDL。"""
+    drive = settings.drive.lower()
+    if drive == "sqlite":
+        raise ValueError("Server-level URLs are not used for sqlite")
+    prefix, suffix = _url_parts(settings)
+    if drive == "sqlserver":
+        return prefix + "master" + suffix
+    return prefix + suffix
+
 
+@contextmanager
+def database_ddl_engine(settings: DatabaseSettings, db_name: str) -> Iterator[Engine]:
+    """建表专用的临时引擎：URL 直接指向 db_name（NullPool），用完释放，不占用请求连接池。"""
+    engine = create_engine(_build_url(settings, db_name), poolclass=NullPool, future=True)
+    try:
+        yield engine
+    finally:
+        engine.dispose()
 
-def _create_sessionmaker(url: str):
-    engine = _create_engine(url)
-    return sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+
+def _create_sessionmaker(url: str, settings: Optional[DatabaseSettings] = None):
+    # 每个库一个连接池，URL 带库名：反射（has_table/inspect）与 default_schema_name 都指向该库。
+    bind = _create_engine(url, settings)
+    # 请求级会话提交后即关闭，不需要提交时把全部对象置为过期、访问时再逐个 SELECT 回来。
+    return sessionmaker(bind=bind, autoflush=False, autocommit=False, expire_on_commit=False, future=True)
 
 
 @dataclass(frozen=True)
@@ -62,20 +144,41 @@ def _make_registry(settings: ServerSettings) -> SessionRegistry:
     defect_url = _build_url(settings.database, defect_db)
     management_url = _build_url(settings.database, management_db)
     return SessionRegistry(
-        main=_create_sessionmaker(main_url),
-        defect=_create_sessionmaker(defect_url),
-        management=_create_sessionmaker(management_url),
+        main=_create_sessionmaker(main_url, settings.database),
+        defect=_create_sessionmaker(defect_url, settings.database),
+        management=_create_sessionmaker(management_url, settings.database),
     )
 
 
-_REGISTRY_CACHE: dict[str, SessionRegistry] = {}
+_REGISTRY_CACHE: dict[tuple, SessionRegistry] = {}
+
+
+def _settings_signature(settings: DatabaseSettings) -> tuple:
+    # 只取与连接相关的字段；比 model_dump_json() 整树序列化便宜得多（每个请求都会走到）。
+    return (
+        settings.drive,
+        settings.host,
+        settings.resolved_port,
+        settings.user,
+        settings.password,
+        settings.charset,
+        settings.database_type,
+        settings.management_database,
+        settings.sqlite_dir,
+        settings.pool_size,
+        settings.max_overflow,
+        settings.pool_timeout,
+        settings.pool_recycle,
+        settings.pool_pre_ping,
+        settings.query_cache_size,
+    )
 
 
 def get_session_registry(settings: ServerSettings) -> SessionRegistry:
     """
     Build or retrieve cached session factories for the given settings.
     """
-    signature = settings.model_dump_json()
+    signature = _settings_signature(settings.database)
     cached = _REGISTRY_CACHE.get(signature)
     if cached:
         return cached
@@ -89,6 +192,12 @@ def get_main_session(settings: ServerSettings):
     return registry.main()
 
 
+def get_main_engine(settings: ServerSettings) -> Engine:
+    """主库会话绑定的引擎，供无需 ORM 会话的轻量 Core 查询直接取连接。"""
+    registry = get_session_registry(settings)
+    return registry.main.kw["bind"]
+
+
 def get_defect_session(settings: ServerSettings):
     registry = get_session_registry(settings)
     return registry.defect()
@@ -99,34 +208,30 @@ def get_management_session(settings: ServerSettings):
     return registry.management()
 
 
-def ensure_database_exists(settings: DatabaseSettings, db_name: str) -> None:
+def ensure_databases_exist(settings: DatabaseSettings, db_names: Iterable[str]) -> None:
+    """在同一条实例级连接上批量执行建库 DDL（临时引擎，用完释放）。"""
     drive = settings.drive.lower()
     if drive == "sqlite":
         if settings.sqlite_dir:
             settings.sqlite_dir.mkdir(parents=True, exist_ok=True)
         return
-    user = quote_plus(settings.user)
-    password = quote_plus(settings.password)
-    host = settings.host
-    port = settings.resolved_port
     if drive == "mysql":
-        url = f"mysql+pymysql://{user}:{password}@{host}:{port}/"
-        engine = _create_engine(url)
-        with engine.begin() as connection:
-            connection.execute(
-                text(
-                    f"CREATE DATABASE IF NOT EXISTS `{db_name}` DEFAULT CHARACTER SET {settings.charset}"
-                )
-            )
-        engine.dispose()
+        statement = "CREATE DATABASE IF NOT EXISTS `{name}` DEFAULT CHARACTER SET {charset}"
+    elif drive == "sqlserver":
+        statement = "IF DB_ID(N'{name}') IS NULL CREATE DATABASE [{name}]"
+    else:
+        raise ValueError(f"Unsupported database driver: {drive}")
+    names = [name for name in dict.fromkeys(db_names) if name]
+    if not names:
         return
-    if drive == "sqlserver":
-        url = f"mssql+pymssql://{user}:{password}@{host}:{port}/master"
-        engine = _create_engine(url)
+    engine = create_engine(_build_server_url(settings), poolclass=NullPool, future=True)
+    try:
         with engine.begin() as connection:
-            connection.execute(
-                text(f"IF DB_ID(N'{db_name}') IS NULL CREATE DATABASE [{db_name}]")
-            )
+            for name in names:
+                connection.execute(text(statement.format(name=name, charset=settings.charset)))
+    finally:
         engine.dispose()
-        return
-    raise ValueError(f"Unsupported database driver: {drive}")
+
+
+def ensure_database_exists(settings: DatabaseSettings, db_name: str) -> None:
+    ensure_databases_exist(settings, (db_name,))
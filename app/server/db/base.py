@@ -0,0 +1,22 @@
+# coding: utf-8
+from __future__ import annotations
+
+from sqlalchemy import MetaData
+from sqlalchemy.orm import declarative_base
+
+# ix_ 与 SQLAlchemy 默认的 index=True 命名一致，保证已有索引名不变；其余约束获得确定的名称。
+NAMING_CONVENTION = {
+    "ix": "ix_%(column_0_label)s",
+    "uq": "uq_%(table_name)s_%(column_0_name)s",
+    "ck": "ck_%(table_name)s_%(constraint_name)s",
+    "fk": "fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s",
+    "pk": "pk_%(table_name)s",
+}
+
+
+def make_base():
+    """
+    每个数据库（源数据 ncdplate / ncdplatedefect、管理库、扩展库）各用一个 Base，
+    各自的 metadata 只包含该库的表，create_all 不会把别的库的表建到当前库。
+    """
+    return declarative_base(metadata=MetaData(naming_convention=NAMING_CONVENTION))
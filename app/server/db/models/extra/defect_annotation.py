@@ -1,8 +1,9 @@
 # coding: utf-8
-from sqlalchemy import Column, DateTime, Integer, String, Text, func, JSON
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy import Column, DateTime, Index, Integer, String, Text, func, JSON
 
-Base = declarative_base()
+from app.server.db.base import make_base
+
+Base = make_base()
 metadata = Base.metadata
 
 
@@ -10,10 +11,12 @@ class DefectAnnotation(Base):
     """缺陷标注表，用于记录人工/自动标注信息。"""
 
     __tablename__ = "defect_annotation"
+    # 查询总是按 line_key + seq_no（+ surface/view）定位；复合索引的前缀同时覆盖只按产线查询。
+    __table_args__ = (Index("ix_defect_annotation_lksv", "line_key", "seq_no", "surface", "view"),)
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    line_key = Column(String(64), nullable=False, index=True, comment="产线 key")
-    seq_no = Column(Integer, nullable=False, index=True, comment="钢板流水号 SeqNo")
+    line_key = Column(String(64), nullable=False, comment="产线 key")
+    seq_no = Column(Integer, nullable=False, comment="钢板流水号 SeqNo")
     surface = Column(String(16), nullable=False, comment="表面：top/bottom")
     view = Column(String(32), nullable=False, comment="视角模式：2D 等")
 
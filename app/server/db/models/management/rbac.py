@@ -3,10 +3,12 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Text, UniqueConstraint, func
-from sqlalchemy.orm import declarative_base, relationship
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String, Text, UniqueConstraint, func
+from sqlalchemy.orm import relationship
 
-Base = declarative_base()
+from app.server.db.base import make_base
+
+Base = make_base()
 metadata = Base.metadata
 
 
@@ -74,10 +76,15 @@ class CacheRecord(Base):
     """
 
     __tablename__ = "cache_records"
+    __table_args__ = (
+        Index("ix_cache_records_lksv", "line_key", "seq_no", "surface", "view"),
+        # 最新缓存流水号：max(seq_no) WHERE line_key=? AND view=?
+        Index("ix_cache_records_lvs", "line_key", "view", "seq_no"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    line_key = Column(String(64), nullable=False, index=True, comment="产线 key（对应 DEFECT_LINE_KEY 或映射表配置）")
-    seq_no = Column(Integer, nullable=False, index=True, comment="钢板流水号 SeqNo")
+    line_key = Column(String(64), nullable=False, comment="产线 key（对应 DEFECT_LINE_KEY 或映射表配置）")
+    seq_no = Column(Integer, nullable=False, comment="钢板流水号 SeqNo")
     surface = Column(String(16), nullable=False, comment="表面：top/bottom")
     view = Column(String(32), nullable=False, comment="视角模式：2D 等")
     tile_max_level = Column(Integer, nullable=True, comment="瓦片缓存最大层级（cache.json.tile.max_level）")
@@ -96,10 +103,11 @@ class DefectStat(Base):
     """
 
     __tablename__ = "defect_stats"
+    __table_args__ = (Index("ix_defect_stats_lks", "line_key", "seq_no", "surface"),)
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    line_key = Column(String(64), nullable=False, index=True, comment="产线 key")
-    seq_no = Column(Integer, nullable=False, index=True, comment="钢板流水号 SeqNo")
+    line_key = Column(String(64), nullable=False, comment="产线 key")
+    seq_no = Column(Integer, nullable=False, comment="钢板流水号 SeqNo")
     surface = Column(String(16), nullable=True, comment="表面：top/bottom，可为空表示整板统计")
     defect_name = Column(String(64), nullable=False, comment="缺陷名称/类别显示名称")
     defect_class = Column(Integer, nullable=True, comment="缺陷类别编号（camdefect 表中的 defectClass）")
@@ -113,10 +121,11 @@ class SteelGrade(Base):
     """
 
     __tablename__ = "steel_grades"
+    __table_args__ = (Index("ix_steel_grades_ls", "line_key", "seq_no"),)
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    line_key = Column(String(64), nullable=False, index=True, comment="产线 key")
-    seq_no = Column(Integer, nullable=False, index=True, comment="钢板流水号 SeqNo")
+    line_key = Column(String(64), nullable=False, comment="产线 key")
+    seq_no = Column(Integer, nullable=False, comment="钢板流水号 SeqNo")
     steel_id = Column(String(64), nullable=True, comment="钢板号/卷号")
     grade = Column(String(32), nullable=True, comment="钢板等级（如 A/B/C，或自定义编码）")
     grade_code = Column(Integer, nullable=True, comment="钢板等级数字编码（与 steelrecord.Grade 可关联）")
@@ -131,10 +140,11 @@ class DefectGrade(Base):
     """
 
     __tablename__ = "defect_grades"
+    __table_args__ = (Index("ix_defect_grades_lks", "line_key", "seq_no", "surface"),)
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    line_key = Column(String(64), nullable=False, index=True, comment="产线 key")
-    seq_no = Column(Integer, nullable=False, index=True, comment="钢板流水号 SeqNo")
+    line_key = Column(String(64), nullable=False, comment="产线 key")
+    seq_no = Column(Integer, nullable=False, comment="钢板流水号 SeqNo")
     surface = Column(String(16), nullable=False, comment="表面：top/bottom")
     defect_id = Column(Integer, nullable=False, index=True, comment="缺陷 ID（对应 camdefect 表 defectID）")
     defect_class = Column(Integer, nullable=True, comment="缺陷类别编号")
@@ -1,9 +1,10 @@
 # coding: utf-8
-from sqlalchemy import Column, DateTime, Integer, SmallInteger, text
+from sqlalchemy import Column, DateTime, Index, Integer, SmallInteger, text
 from sqlalchemy.dialects.mysql import TINYINT, VARCHAR
-from sqlalchemy.orm import declarative_base
 
-Base = declarative_base()
+from app.server.db.base import make_base
+
+Base = make_base()
 metadata = Base.metadata
 
 
@@ -26,6 +27,12 @@ class Steelrecord(Base):
     """钢板检测结果主表，一卷（序列号）一条记录。"""
 
     __tablename__ = 'steelrecord'
+    # 详情/分页均按 SeqNo 查找；同一 SeqNo 可能有多条（按 ID 倒序取最新），故为普通索引而非唯一索引。
+    # 心跳取最新检测时间（MAX）与按日期导出都按 DetectTime 查找，单列索引即可让 MAX 只探一次索引末端。
+    __table_args__ = (
+        Index("ix_steelrecord_seqno_id", "SeqNo", "ID"),
+        Index("ix_steelrecord_detecttime", "DetectTime"),
+    )
 
     id = Column("ID", Integer, primary_key=True, comment="主键 ID")
     seqNo = Column("SeqNo", Integer, nullable=False, comment="钢板序列号（流水号）")
@@ -47,8 +54,9 @@ class Steelwidth(Base):
     """钢板宽度/长度采样信息，用于更精细的尺寸分析。"""
 
     __tablename__ = 'steelwidth'
+    __table_args__ = (Index("ix_steelwidth_seqno_len", "seqNo", "len"),)
 
     id = Column(Integer, primary_key=True, comment="主键 ID")
-    seqNo = Column(Integer, nullable=False, index=True, comment="钢板序列号（流水号）")
+    seqNo = Column(Integer, nullable=False, comment="钢板序列号（流水号）")
     len = Column(Integer, comment="该采样段长度（mm）")
     width = Column(Integer, comment="该采样段宽度（mm）")
@@ -1,16 +1,18 @@
 from __future__ import annotations
 
 from contextlib import contextmanager
-from functools import lru_cache
+from functools import cache
 import os
+import threading
 from pathlib import Path
 
 from typing import Generator
 
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
 
 from .config.settings import ServerSettings, ensure_config_file
-from .database import get_defect_session, get_main_session, get_management_session
+from .database import get_defect_session, get_main_engine as _get_main_engine, get_main_session, get_management_session
 from .rbac.manager import bootstrap_management
 
 TEST_MODE_ENV = "DEFECT_TEST_MODE"
@@ -24,39 +26,44 @@ def _is_truthy(value: str | None) -> bool:
     return value.strip().lower() in {"1", "true", "yes", "y", "on"}
 
 
-@lru_cache()
-def get_settings() -> ServerSettings:
-    ensure_config_file()
-    settings = ServerSettings.load()
+def _test_mode_overrides(settings: ServerSettings) -> dict | None:
+    """
+    TestData 模式下对配置的覆盖项（SQLite + 本地图像目录）；非测试模式返回 None。
+    环境变量由启动入口在 import 之后才写入（main.py --test_data），因此在首次取配置时解析，
+    不能放到模块级常量里。
+    """
     if not _is_truthy(os.getenv(TEST_MODE_ENV)):
-        return settings
-
+        return None
     testdata_dir = Path(os.getenv(TESTDATA_DIR_ENV, str(DEFAULT_TESTDATA_DIR))).resolve()
-    sqlite_dir = testdata_dir / "DataBase"
     image_root = testdata_dir / "Image"
+    return {
+        "test_mode": True,
+        "testdata_dir": testdata_dir,
+        "database": settings.database.model_copy(
+            update={
+                "drive": "sqlite",
+                "sqlite_dir": testdata_dir / "DataBase",
+            }
+        ),
+        "images": settings.images.model_copy(
+            update={
+                "top_root": image_root,
+                "bottom_root": image_root,
+                # In TestData mode, prefer local disk cache data
+                # by pointing disk cache roots to the same Image tree.
+                "disk_cache_top_root": image_root,
+                "disk_cache_bottom_root": image_root,
+            }
+        ),
+    }
 
-    return settings.model_copy(
-        update={
-            "test_mode": True,
-            "testdata_dir": testdata_dir,
-            "database": settings.database.model_copy(
-                update={
-                    "drive": "sqlite",
-                    "sqlite_dir": sqlite_dir,
-                }
-            ),
-            "images": settings.images.model_copy(
-                update={
-                    "top_root": image_root,
-                    "bottom_root": image_root,
-                    # In TestData mode, prefer local disk cache data
-                    # by pointing disk cache roots to the same Image tree.
-                    "disk_cache_top_root": image_root,
-                    "disk_cache_bottom_root": image_root,
-                }
-            ),
-        }
-    )
+
+@cache
+def get_settings() -> ServerSettings:
+    ensure_config_file()
+    settings = ServerSettings.load()
+    overrides = _test_mode_overrides(settings)
+    return settings if overrides is None else settings.model_copy(update=overrides)
 
 
 def get_main_db() -> Generator[Session, None, None]:
@@ -78,6 +85,10 @@ def get_main_db_context() -> Generator[Session, None, None]:
         gen.close()
 
 
+def get_main_engine() -> Engine:
+    return _get_main_engine(get_settings())
+
+
 def get_defect_db() -> Generator[Session, None, None]:
     settings = get_settings()
     session = get_defect_session(settings)
@@ -97,29 +108,55 @@ def get_defect_db_context() -> Generator[Session, None, None]:
         gen.close()
 
 
-def get_management_db() -> Generator[Session, None, None]:
+@cache
+def _get_management_settings() -> ServerSettings:
+    """
+    管理库连接配置；host 仍为 "{ip}" 模板时回退到本地 SQLite。
+    结果随 get_settings() 一起缓存，避免每个请求重复 model_copy 与 mkdir。
+    """
     settings = get_settings()
     db_settings = settings.database
-    if db_settings.drive != "sqlite" and "{ip}" in (db_settings.host or ""):
-        fallback_dir = Path(__file__).resolve().parents[2] / "work" / "local_db"
-        fallback_dir.mkdir(parents=True, exist_ok=True)
-        fallback_settings = settings.model_copy(
-            update={
-                "database": db_settings.model_copy(
-                    update={"drive": "sqlite", "sqlite_dir": fallback_dir}
-                )
-            }
-        )
-        session = get_management_session(fallback_settings)
+    if db_settings.drive == "sqlite" or "{ip}" not in (db_settings.host or ""):
+        return settings
+    fallback_dir = Path(__file__).resolve().parents[2] / "work" / "local_db"
+    fallback_dir.mkdir(parents=True, exist_ok=True)
+    return settings.model_copy(
+        update={
+            "database": db_settings.model_copy(
+                update={"drive": "sqlite", "sqlite_dir": fallback_dir}
+            )
+        }
+    )
+
+
+_MANAGEMENT_INIT_LOCK = threading.Lock()
+_MANAGEMENT_INITIALIZED = False
+
+
+def init_management_db() -> None:
+    """
+    管理库初始化（建表、admin 账号、casbin 策略）每个进程只执行一次。
+    由应用启动流程调用；失败时不置位，下次获取会话时重试。
+    """
+    global _MANAGEMENT_INITIALIZED
+    if _MANAGEMENT_INITIALIZED:
+        return
+    with _MANAGEMENT_INIT_LOCK:
+        if _MANAGEMENT_INITIALIZED:
+            return
+        settings = _get_management_settings()
+        session = get_management_session(settings)
         try:
-            bootstrap_management(fallback_settings, session)
-            yield session
+            bootstrap_management(settings, session)
         finally:
             session.close()
-        return
-    session = get_management_session(settings)
+        _MANAGEMENT_INITIALIZED = True
+
+
+def get_management_db() -> Generator[Session, None, None]:
+    init_management_db()
+    session = get_management_session(_get_management_settings())
     try:
-        bootstrap_management(settings, session)
         yield session
     finally:
         session.close()
@@ -1,29 +1,35 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import os
 import sys
 import logging
 from pathlib import Path
-from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, suppress
 from datetime import datetime
-from threading import Event, Thread
 
 # Ensure repository root is on sys.path before importing app.*
 REPO_ROOT = Path(__file__).resolve().parents[2]
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
+import anyio.to_thread
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import func, text
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import func, select, text
+from starlette.types import ASGIApp, Receive, Scope, Send
 import requests
 
 from app.server import deps
 from app.server.api import defects, health, images, steels, meta, net, admin, cache, status, annotations
-from app.server.api.dependencies import get_image_service
+from app.server.api.dependencies import get_image_service, get_steel_service
+from app.server.api.utils import defect_class_labels
+from app.server.cache import ResponseCacheMiddleware
 from app.server.config.settings import ENV_CONFIG_KEY, ensure_config_file
-from app.server.rbac.manager import bootstrap_management
+from app.server.database import get_session_registry
 from app.server.db.models.source.ncdplate import Steelrecord
 from app.server.status_service import get_status_service
 
@@ -38,12 +44,20 @@ LINE_KIND_ENV = "DEFECT_LINE_KIND"
 LINE_HOST_ENV = "DEFECT_LINE_HOST"
 LINE_PORT_ENV = "DEFECT_LINE_PORT"
 HEARTBEAT_INTERVAL_ENV = "DEFECT_CONFIG_HEARTBEAT_INTERVAL_SECONDS"
+DB_WARM_SIZE_ENV = "BKJC_DB_WARM_SIZE"
+THREAD_POOL_SIZE_ENV = "BKJC_THREAD_POOL_SIZE"
+DEFAULT_THREAD_POOL_SIZE = 64
+RESPONSE_CACHE_TTL_SECONDS = 1
 
 
 class _SuppressAccessLogFilter(logging.Filter):
     def filter(self, record: logging.LogRecord) -> bool:
-        message = record.getMessage()
-        return " /config/api_status " not in message
+        # uvicorn 访问日志参数为 (client_addr, method, full_path, http_version, status_code)：
+        # 直接比较路径，不为每条访问日志做一次 % 格式化。
+        args = record.args
+        if isinstance(args, tuple) and len(args) >= 3:
+            return args[2] != "/config/api_status"
+        return " /config/api_status " not in record.getMessage()
 
 
 logging.getLogger("uvicorn.access").addFilter(_SuppressAccessLogFilter())
@@ -64,10 +78,15 @@ def _parse_int(value: str | None) -> int | None:
     return None
 
 
+# 预先构建的语句：每次心跳直接执行，依赖 steelrecord 上的 DetectTime 索引。
+_LATEST_DETECT_TIME = select(func.max(Steelrecord.detectTime))
+
+
 def _collect_status_payload(
     line_key: str,
     line_name: str | None,
     line_kind: str | None,
+    identity: dict[str, object],
     last_versions: dict[str, int],
     last_log_cursors: dict[str, int],
 ) -> tuple[dict[str, object], dict[str, int], dict[str, int]]:
@@ -76,8 +95,9 @@ def _collect_status_payload(
     online = True
     status_service = get_status_service()
     try:
-        with deps.get_main_db_context() as session:
-            latest = session.query(func.max(Steelrecord.detectTime)).scalar()
+        # 只读一个聚合值：直接取连接执行 Core 语句，不建 ORM 会话
+        with deps.get_main_engine().connect() as connection:
+            latest = connection.execute(_LATEST_DETECT_TIME).scalar()
         if latest is not None:
             latest_timestamp = latest.isoformat()
             latest_age_seconds = max(0, int((datetime.utcnow() - latest).total_seconds()))
@@ -117,9 +137,7 @@ def _collect_status_payload(
         "key": line_key,
         "name": line_name,
         "kind": line_kind or "default",
-        "host": os.getenv(LINE_HOST_ENV),
-        "port": _parse_int(os.getenv(LINE_PORT_ENV)),
-        "pid": os.getpid(),
+        **identity,
         "online": online,
         "latest_timestamp": latest_timestamp,
         "latest_age_seconds": latest_age_seconds,
@@ -136,44 +154,131 @@ def _collect_status_payload(
     return payload, next_versions, next_cursors
 
 
-def _status_reporter(stop_event: Event, base_url: str, line_key: str, line_name: str | None, line_kind: str | None) -> None:
+async def _status_reporter(base_url: str, line_key: str, line_name: str | None, line_kind: str | None) -> None:
+    """定时向配置中心上报状态：作为事件循环中的任务运行，阻塞的查库与 HTTP 调用放到线程中执行。"""
     interval = _parse_int(os.getenv(HEARTBEAT_INTERVAL_ENV)) or 15
     status_url = _resolve_status_url(base_url)
     last_versions: dict[str, int] = {}
     last_log_cursors: dict[str, int] = {}
-    while not stop_event.is_set():
-        payload, last_versions, last_log_cursors = _collect_status_payload(
-            line_key, line_name, line_kind, last_versions, last_log_cursors
-        )
-        try:
-            requests.post(status_url, json=payload, timeout=5)
-        except Exception:
-            logger.exception("Failed to post status update to config center: %s", status_url)
-        stop_event.wait(interval)
+    # 进程启动后这些值不会变化，上报开始时读取一次，不在每次心跳重复解析环境变量
+    identity: dict[str, object] = {
+        "host": os.getenv(LINE_HOST_ENV),
+        "port": _parse_int(os.getenv(LINE_PORT_ENV)),
+        "pid": os.getpid(),
+    }
+    # 复用同一个 Session 保持长连接，避免每次心跳重新建立 TCP 连接
+    with requests.Session() as http:
+        while True:
+            payload, last_versions, last_log_cursors = await asyncio.to_thread(
+                _collect_status_payload, line_key, line_name, line_kind, identity, last_versions, last_log_cursors
+            )
+            try:
+                await asyncio.to_thread(http.post, status_url, json=payload, timeout=5)
+            except Exception:
+                logger.exception("Failed to post status update to config center: %s", status_url)
+            await asyncio.sleep(interval)
 
 
-@asynccontextmanager
-async def app_lifespan(app: FastAPI):
-    """应用生命周期管理：启动时预热数据库连接。"""
+def _open_warm_session(factory):
+    session = factory()
     try:
-        with deps.get_main_db_context() as session:
-            session.execute(text("SELECT 1"))
+        session.execute(text("SELECT 1"))
     except Exception:
-        logger.exception("Failed to warm up main database connection.")
+        session.close()
+        raise
+    return session
+
 
+async def _warm_up_database(name: str, factory, count: int) -> None:
+    """并发检出 count 条连接并各执行一次 SELECT 1，全部就绪后再一起归还，使连接池预先填满。"""
+    results = await asyncio.gather(
+        *(asyncio.to_thread(_open_warm_session, factory) for _ in range(count)),
+        return_exceptions=True,
+    )
+    failures = [result for result in results if isinstance(result, BaseException)]
+    for result in results:
+        if not isinstance(result, BaseException):
+            result.close()
+    if failures:
+        logger.error(
+            "Failed to warm up %s database connection (%d/%d).",
+            name,
+            len(failures),
+            count,
+            exc_info=failures[0],
+        )
+
+
+async def _init_management_db() -> None:
     try:
-        settings = deps.get_settings()
-        with deps.get_management_db_context() as session:
-            bootstrap_management(settings, session)
+        await asyncio.to_thread(deps.init_management_db)
     except Exception:
         logger.exception("Failed to initialize management database.")
 
+
+def _warm_up_lazy_singletons() -> None:
+    """预先构建首个请求才会触发的单例与缓存：SteelService 与缺陷字典映射（需读取 JSON）。"""
+    try:
+        get_steel_service()
+        defect_class_labels()
+    except Exception:
+        logger.exception("Failed to warm up API singletons.")
+
+
+def _start_image_workers() -> None:
     try:
         get_image_service().start_background_workers()
     except Exception:
         logger.exception("Failed to start background cache workers.")
-    status_stop: Event | None = None
-    status_thread: Thread | None = None
+
+
+def _stop_image_workers() -> None:
+    try:
+        get_image_service().stop_background_workers()
+    except Exception:
+        logger.exception("Failed to stop background cache workers.")
+    images.shutdown_image_pool()
+
+
+@asynccontextmanager
+async def _db_lifespan(app: FastAPI):
+    """提前构建会话工厂并填满连接池，避免首批请求承担建引擎与握手的耗时；
+    各库预热与管理库初始化在线程中并发进行，互不等待。"""
+    try:
+        settings = await asyncio.to_thread(deps.get_settings)
+        registry = await asyncio.to_thread(get_session_registry, settings)
+    except Exception:
+        logger.exception("Failed to build database session registry.")
+        registry = None
+    startup = [_init_management_db(), asyncio.to_thread(_warm_up_lazy_singletons)]
+    if registry is not None:
+        # 每个库各自一个连接池：主库承载列表与心跳查询，按 pool_size 预热；缺陷库只预建一条连接。
+        # SQLite 每个库一个文件，各建一条连接。
+        pool_size = 1 if settings.database.drive.lower() == "sqlite" else settings.database.pool_size
+        # BKJC_DB_WARM_SIZE 可覆盖预热连接数（0 表示不预热主库）
+        warm_size = _parse_int(os.getenv(DB_WARM_SIZE_ENV))
+        if warm_size is not None:
+            pool_size = warm_size
+        startup.append(_warm_up_database("main", registry.main, pool_size))
+        startup.append(_warm_up_database("defect", registry.defect, 1))
+    await asyncio.gather(*startup)
+    yield
+
+
+@asynccontextmanager
+async def _workers_lifespan(app: FastAPI):
+    """图像服务后台线程（预取、目录监视、磁盘缓存）：构建与启停都会阻塞，放到线程中执行。"""
+    await asyncio.to_thread(_start_image_workers)
+    try:
+        yield
+    finally:
+        await asyncio.to_thread(_stop_image_workers)
+
+
+@asynccontextmanager
+async def _heartbeat_lifespan(app: FastAPI):
+    """向配置中心定时上报状态的后台任务。"""
+    status_task: asyncio.Task | None = None
     config_center_url = os.getenv(CONFIG_CENTER_URL_ENV, "").strip()
     if not config_center_url:
         try:
@@ -186,25 +291,71 @@ async def app_lifespan(app: FastAPI):
     line_name = os.getenv(LINE_NAME_ENV)
     line_kind = os.getenv(LINE_KIND_ENV)
     if config_center_url and line_key:
-        status_stop = Event()
-        status_thread = Thread(
-            target=_status_reporter,
-            args=(status_stop, config_center_url, line_key, line_name, line_kind),
-            daemon=True,
+        status_task = asyncio.create_task(
+            _status_reporter(config_center_url, line_key, line_name, line_kind)
         )
-        status_thread.start()
-    yield
     try:
-        get_image_service().stop_background_workers()
-    except Exception:
-        logger.exception("Failed to stop background cache workers.")
-    if status_stop:
-        status_stop.set()
-    if status_thread:
-        status_thread.join(timeout=2)
+        yield
+    finally:
+        if status_task:
+            status_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await status_task
+
+
+def _configure_thread_pools() -> None:
+    """
+    按 BKJC_THREAD_POOL_SIZE（默认 64，按每个 uvicorn worker 进程计）放宽线程并发上限：
+    同步路由与依赖走 anyio 的线程限流器，asyncio.to_thread 走事件循环默认执行器，两者一并设置。
+    """
+    size = _parse_int(os.getenv(THREAD_POOL_SIZE_ENV)) or DEFAULT_THREAD_POOL_SIZE
+    anyio.to_thread.current_default_thread_limiter().total_tokens = size
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=size, thread_name_prefix="bkjc-io")
+    )
 
 
-app = FastAPI(title="Web Defect Detection API", version=API_VERSION, lifespan=app_lifespan)
+@asynccontextmanager
+async def app_lifespan(app: FastAPI):
+    """应用生命周期管理：依次预热数据库、启动图像后台线程、启动状态上报；关闭时按相反顺序退出。"""
+    _configure_thread_pools()
+    async with _db_lifespan(app), _workers_lifespan(app), _heartbeat_lifespan(app):
+        yield
+
+
+class ConfigAliasMiddleware:
+    """
+    /config/* 作为 /api/* 的别名：admin 路由只在 /api 下注册一次，
+    请求路径命中 admin 路由时在分发前改写为 /api 前缀，路由表不再重复一份。
+    只改写 admin 自身的路径，其余 /config/* 保持原样（仍为 404）。
+    """
+
+    def __init__(self, app: ASGIApp, *, prefix: str = "/config", target: str = "/api") -> None:
+        self.app = app
+        self._prefix = prefix
+        self._target = target
+        self._patterns = [route.path_regex for route in admin.router.routes if hasattr(route, "path_regex")]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] in ("http", "websocket"):
+            path: str = scope["path"]
+            if path.startswith(self._prefix + "/"):
+                rest = path[len(self._prefix):]
+                if any(pattern.match(rest) for pattern in self._patterns):
+                    scope = dict(scope, path=self._target + rest)
+                    raw_path = scope.get("raw_path")
+                    if raw_path:
+                        # raw_path 保持百分号编码形式，只替换前缀
+                        scope["raw_path"] = self._target.encode() + raw_path[len(self._prefix):]
+        await self.app(scope, receive, send)
+
+
+app = FastAPI(
+    title="Web Defect Detection API",
+    version=API_VERSION,
+    lifespan=app_lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 _cors_env = os.getenv("CORS_ALLOW_ORIGINS", "*")
 _cors_origins = [origin.strip() for origin in _cors_env.split(",") if origin.strip()]
@@ -213,6 +364,18 @@ if _cors_env != "*":
         if origin not in _cors_origins:
             _cors_origins.append(origin)
 
+# 列表接口的编码结果短时缓存：SteelService/DefectService 已按各自 TTL 缓存查询结果，
+# 这里只吸收同一时刻的重复序列化，TTL 取 1s，数据最长陈旧时间为服务缓存 TTL + 1s。
+# 空列表由路由标记 no-store，与服务层"空结果不缓存"一致。
+# 先于 CORS 注册（位于 CORS 之内），缓存内容不含按 Origin 生成的 CORS 响应头。
+app.add_middleware(
+    ResponseCacheMiddleware,
+    ttl_by_path={
+        "/api/steels": RESPONSE_CACHE_TTL_SECONDS,
+        "/api/steels/search": RESPONSE_CACHE_TTL_SECONDS,
+        "/api/defects/": RESPONSE_CACHE_TTL_SECONDS,
+    },
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=_cors_origins if _cors_origins else ["*"],
@@ -220,6 +383,7 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(ConfigAliasMiddleware)
 
 
 def _ensure_testdata_dir(testdata_dir: Path) -> None:
@@ -244,8 +408,8 @@ app.include_router(images.router)
 app.include_router(meta.router)
 app.include_router(net.router)
 app.include_router(status.router)
+# /config/* 由 ConfigAliasMiddleware 改写到这里，不再重复注册一份 admin 路由。
 app.include_router(admin.router, prefix="/api")
-app.include_router(admin.router, prefix="/config")
 app.include_router(cache.router)
 
 
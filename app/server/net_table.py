@@ -1,16 +1,25 @@
 from __future__ import annotations
 
-import json
+import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional, Sequence
 from urllib.parse import quote
 
+import orjson
+
+# 与原先 json.dumps(ensure_ascii=False, indent=2) 输出格式一致，允许整数等非字符串键。
+_JSON_DUMP_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+
 REPO_ROOT = Path(__file__).resolve().parents[2]
 CONFIG_DIR = REPO_ROOT / "configs"
 CURRENT_ROOT = CONFIG_DIR / "current"
 TEMPLATE_ROOT = CONFIG_DIR / "template"
 GENERATED_ROOT = CURRENT_ROOT / "generated"
+# 批量生成产线配置时的并发线程数（每个任务只有少量小文件读写）
+BUILD_CONFIG_WORKERS = 8
 
 
 def _ensure_current_root() -> Path:
@@ -30,13 +39,34 @@ def resolve_net_table_dir(hostname: str | None = None) -> Path:
     return _ensure_current_root()
 
 
+# map.json 解析结果缓存：{路径: (mtime_ns, size, 解析结果)}。文件未变时只需一次 stat；
+# 返回的是共享对象，调用方只读，修改后请通过 save_map_payload 写回。
+_MAP_CACHE: dict[Path, tuple[int, int, Any]] = {}
+
+
+def _read_map_json(map_path: Path) -> Any:
+    """读取并解析 map.json；文件不存在或为空时返回 None。"""
+    try:
+        stat = os.stat(map_path)
+    except OSError:
+        return None
+    if stat.st_size == 0:
+        return None
+    cached = _MAP_CACHE.get(map_path)
+    if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+    payload = orjson.loads(map_path.read_bytes())
+    _MAP_CACHE[map_path] = (stat.st_mtime_ns, stat.st_size, payload)
+    return payload
+
+
 def load_map_config(hostname: str | None = None) -> dict[str, Any]:
     root = resolve_net_table_dir(hostname)
     map_path = root / "map.json"
     views: dict[str, Any] = {}
     log_config: dict[str, Any] = {}
-    if map_path.exists() and map_path.stat().st_size > 0:
-        payload = json.loads(map_path.read_text(encoding="utf-8"))
+    payload = _read_map_json(map_path)
+    if payload is not None:
         if isinstance(payload, list):
             lines = payload
         elif isinstance(payload, dict):
@@ -54,8 +84,8 @@ def load_map_payload(hostname: str | None = None) -> tuple[Path, dict[str, Any]]
     root = resolve_net_table_dir(hostname)
     map_path = root / "map.json"
     views: dict[str, Any] = {}
-    if map_path.exists() and map_path.stat().st_size > 0:
-        payload = json.loads(map_path.read_text(encoding="utf-8"))
+    payload = _read_map_json(map_path)
+    if payload is not None:
         if isinstance(payload, list):
             return root, {"views": {}, "lines": payload}
         if isinstance(payload, dict):
@@ -80,27 +110,50 @@ def save_map_payload(payload: dict[str, Any], hostname: str | None = None) -> Pa
         stored["log"] = log_config
     if isinstance(meta, dict) and meta:
         stored["meta"] = meta
-    map_path.write_text(json.dumps(stored, ensure_ascii=False, indent=2), encoding="utf-8")
+    map_path.write_bytes(orjson.dumps(stored, option=_JSON_DUMP_OPTIONS))
+    _MAP_CACHE.pop(map_path, None)
     return map_path
 
 
 def _merge_dict(base: dict[str, Any], override: dict[str, Any]) -> dict[str, Any]:
-    for key, value in (override or {}).items():
-        if isinstance(value, dict) and isinstance(base.get(key), dict):
-            base[key] = _merge_dict(dict(base[key]), value)
-        else:
-            base[key] = value
+    """
+    把 override 深度合并进 base 并返回 base：base 及其嵌套 dict 就地修改（调用方传入的是新解析的模板），
+    override 中的 dict 以副本写入，不会与 map.json 缓存等共享对象产生别名。用显式栈代替递归。
+    """
+    stack = [(base, override or {})]
+    while stack:
+        target, source = stack.pop()
+        for key, value in source.items():
+            if isinstance(value, dict):
+                current = target.get(key)
+                if not isinstance(current, dict):
+                    current = target[key] = {}
+                stack.append((current, value))
+            else:
+                target[key] = value
     return base
 
 
 def _apply_ip_format(value: Any, ip: str | None) -> Any:
+    # 含 {ip} 占位符时只替换占位符（其中的 127.0.0.1 保持不变），否则替换默认回环地址；
+    # 用 str.replace 代替 str.format，不解析其他花括号。
     if ip is None or not isinstance(value, str):
         return value
     if "{ip}" in value:
-        return value.format(ip=ip)
-    if "127.0.0.1" in value:
-        return value.replace("127.0.0.1", ip)
-    return value
+        return value.replace("{ip}", str(ip))
+    return value.replace("127.0.0.1", str(ip))
+
+
+@lru_cache(maxsize=32)
+def _read_template_bytes(path: str, mtime_ns: int, size: int) -> bytes:
+    """按 (路径, mtime_ns, size) 缓存模板原始字节；模板修改后键变化，自动重新读取。"""
+    return Path(path).read_bytes()
+
+
+def _load_template(template_path: Path) -> dict[str, Any]:
+    """每次返回新解析的对象：build_config_for_line 会就地修改，不能共享同一份 dict。"""
+    stat = os.stat(template_path)
+    return orjson.loads(_read_template_bytes(str(template_path), stat.st_mtime_ns, stat.st_size))
 
 
 def build_config_for_line(
@@ -110,7 +163,7 @@ def build_config_for_line(
     view_overrides: dict[str, Any] | None = None,
     override_path: Path | None = None,
 ) -> Path:
-    payload = json.loads(template_path.read_text(encoding="utf-8"))
+    payload = _load_template(template_path)
 
     database = payload.get("database", {}) if isinstance(payload.get("database"), dict) else {}
     images = payload.get("images", {}) if isinstance(payload.get("images"), dict) else {}
@@ -136,7 +189,7 @@ def build_config_for_line(
 
     if override_path and override_path.exists():
         try:
-            overrides = json.loads(override_path.read_text(encoding="utf-8"))
+            overrides = orjson.loads(override_path.read_bytes())
         except Exception:
             overrides = {}
         if isinstance(overrides, dict):
@@ -171,10 +224,38 @@ def build_config_for_line(
     target_dir = GENERATED_ROOT / safe_name / view_suffix
     target_dir.mkdir(parents=True, exist_ok=True)
     target_path = target_dir / template_path.name
-    target_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    content = orjson.dumps(payload, option=_JSON_DUMP_OPTIONS)
+    # 内容未变化时不重写，避免无谓的写盘与 mtime 变化触发下游重新加载
+    try:
+        unchanged = target_path.read_bytes() == content
+    except OSError:
+        unchanged = False
+    if not unchanged:
+        target_path.write_bytes(content)
     return target_path
 
 
+# build_config_for_line 的位置参数：(line, template_path, view_name, view_overrides, override_path)
+ConfigBuildJob = tuple[dict[str, Any], Path, Optional[str], Optional[dict[str, Any]], Optional[Path]]
+
+
+def build_configs(jobs: Sequence[ConfigBuildJob], max_workers: int = BUILD_CONFIG_WORKERS) -> list[Path]:
+    """
+    批量生成多条产线 × 视图的配置，按输入顺序返回配置路径。
+    各任务互不依赖（目标目录按 产线/视图 区分）：模板先读一次进缓存，再在线程池中并发读写各自的文件。
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return []
+    for template_path in {job[1] for job in jobs}:
+        _load_template(template_path)
+    if len(jobs) == 1:
+        return [build_config_for_line(*jobs[0])]
+    workers = max(1, min(max_workers, len(jobs)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="config-build") as executor:
+        return list(executor.map(lambda job: build_config_for_line(*job), jobs))
+
+
 def get_api_list(hostname: str | None = None) -> list[dict[str, Any]]:
     config = load_map_config(hostname)
     lines = config.get("lines") or []
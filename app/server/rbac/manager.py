@@ -13,7 +13,7 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.server.config.settings import ServerSettings
-from app.server.database import _build_url, _create_engine, ensure_database_exists
+from app.server.database import database_ddl_engine, ensure_database_exists
 from app.server.db.models.management import rbac as rbac_models
 
 REPO_ROOT = Path(__file__).resolve().parents[3]
@@ -76,9 +76,8 @@ DEFAULT_MOCKDATA_CONFIG = {
 def initialize_management_database(settings: ServerSettings) -> None:
     db_name = settings.database.management_database
     ensure_database_exists(settings.database, db_name)
-    engine = _create_engine(_build_url(settings.database, db_name))
-    rbac_models.Base.metadata.create_all(engine, checkfirst=True)
-    engine.dispose()
+    with database_ddl_engine(settings.database, db_name) as engine:
+        rbac_models.Base.metadata.create_all(engine, checkfirst=True)
 
 
 def bootstrap_management(settings: ServerSettings, session: Session) -> None:
@@ -357,6 +356,9 @@ def update_user(
             role = _get_or_create_role(session, role_name)
             session.add(rbac_models.UserRole(user_id=user.id, role_id=role.id))
     session.commit()
+    if roles is not None:
+        # 角色关联是直接增删 UserRole 行写入的，需让 user.roles 重新加载。
+        session.expire(user, ["roles"])
     return {
         "id": user.id,
         "username": user.username,
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import List, Optional
 
+from sqlalchemy import bindparam, select
 from sqlalchemy.orm import Session
 
+from ..cache import TtlLruCache
 from ..db.models.source.ncdplatedefect import Camdefect1, Camdefect2
 from ..schemas import (
     BoundingBox,
@@ -12,6 +15,42 @@ from ..schemas import (
     DefectStats,
 )
 
+# 同一块板的缺陷列表会被列表接口、缺陷小图预热、瓦片生成在短时间内重复读取；
+# 正在检测的板仍可能追加缺陷，因此只做短 TTL 缓存。
+DEFECTS_CACHE_TTL_SECONDS = 5
+
+# _to_model 实际读取的列；按列投影查询返回轻量 Row，避免整行 ORM 对象的构造与身份映射开销。
+_DEFECT_COLUMNS = (
+    "defectID",
+    "camNo",
+    "seqNo",
+    "imgIndex",
+    "defectClass",
+    "grade",
+    "area",
+    "leftInSrcImg",
+    "rightInSrcImg",
+    "topInSrcImg",
+    "bottomInSrcImg",
+    "leftInObj",
+    "rightInObj",
+    "topInObj",
+    "bottomInObj",
+)
+
+
+@lru_cache(maxsize=None)
+def _defects_by_seq_stmt(model):
+    # 模块级缓存语句对象：缓存键只计算一次，执行时直接命中引擎编译缓存。
+    columns = [getattr(model, name) for name in _DEFECT_COLUMNS]
+    return select(*columns).where(model.seqNo == bindparam("seq_no"))
+
+
+@lru_cache(maxsize=None)
+def _defect_by_id_stmt(model):
+    columns = [getattr(model, name) for name in _DEFECT_COLUMNS]
+    return select(*columns).where(model.defectID == bindparam("defect_id")).limit(1)
+
 
 class DefectService:
     """
@@ -24,8 +63,21 @@ class DefectService:
         :param session_factory: callable returning sqlalchemy.orm.Session
         """
         self.session_factory = session_factory
+        self._defects_cache: TtlLruCache[tuple, DefectResponse] = TtlLruCache(
+            max_items=128, ttl_seconds=DEFECTS_CACHE_TTL_SECONDS
+        )
 
     def defects_by_seq(self, seq_no: int, surface: Optional[str]) -> DefectResponse:
+        key = (seq_no, surface)
+        cached = self._defects_cache.get(key)
+        if cached is not None:
+            return cached
+        result = self._defects_by_seq(seq_no, surface)
+        if result.items:
+            self._defects_cache.put(key, result)
+        return result
+
+    def _defects_by_seq(self, seq_no: int, surface: Optional[str]) -> DefectResponse:
         with self.session_factory() as session:
             up_items = self._fetch_defects(session, Camdefect1, seq_no) if surface in (None, "top") else []
             down_items = self._fetch_defects(session, Camdefect2, seq_no) if surface in (None, "bottom") else []
@@ -54,7 +106,7 @@ class DefectService:
     def get_defect(self, camera_id: int, defect_id: int) -> Optional[DefectRecord]:
         with self.session_factory() as session:
             model = Camdefect1 if camera_id == 1 else Camdefect2
-            result = session.query(model).filter(model.defectID == defect_id).first()
+            result = self._fetch_defect(session, model, defect_id)
             if not result:
                 return None
             surface = "top" if model is Camdefect1 else "bottom"
@@ -65,7 +117,7 @@ class DefectService:
         model = Camdefect1 if surface == "top" else Camdefect2
         camera_id = 1 if surface == "top" else 2
         with self.session_factory() as session:
-            result = session.query(model).filter(model.defectID == defect_id).first()
+            result = self._fetch_defect(session, model, defect_id)
             if not result:
                 return None
             return self._to_model(result, camera_id=camera_id, surface=surface)
@@ -74,26 +126,23 @@ class DefectService:
     # Helpers
     # ------------------------------------------------------------------ #
     def _fetch_defects(self, session: Session, model, seq_no: int):
-        return session.query(model).filter(model.seqNo == seq_no).all()
+        return session.execute(_defects_by_seq_stmt(model), {"seq_no": seq_no}).all()
+
+    def _fetch_defect(self, session: Session, model, defect_id: int):
+        return session.execute(_defect_by_id_stmt(model), {"defect_id": defect_id}).first()
 
     def _to_model(self, defect, camera_id: int, surface: str) -> DefectRecord:
-        bbox_img = BoundingBox(
-            left=int(getattr(defect, "leftInImg", 0) or 0),
-            top=int(getattr(defect, "topInImg", 0) or 0),
-            right=int(getattr(defect, "rightInImg", 0) or 0),
-            bottom=int(getattr(defect, "bottomInImg", 0) or 0),
-        )
         bbox_src = BoundingBox(
-            left=int(getattr(defect, "leftInSrcImg", getattr(defect, "leftInImg", 0)) or 0),
-            top=int(getattr(defect, "topInSrcImg", getattr(defect, "topInImg", 0)) or 0),
-            right=int(getattr(defect, "rightInSrcImg", getattr(defect, "rightInImg", 0)) or 0),
-            bottom=int(getattr(defect, "bottomInSrcImg", getattr(defect, "bottomInImg", 0)) or 0),
+            left=int(defect.leftInSrcImg or 0),
+            top=int(defect.topInSrcImg or 0),
+            right=int(defect.rightInSrcImg or 0),
+            bottom=int(defect.bottomInSrcImg or 0),
         )
         bbox_obj = BoundingBox(
-            left=int(getattr(defect, "leftInObj", getattr(defect, "leftInImg", 0)) or 0),
-            top=int(getattr(defect, "topInObj", getattr(defect, "topInImg", 0)) or 0),
-            right=int(getattr(defect, "rightInObj", getattr(defect, "rightInImg", 0)) or 0),
-            bottom=int(getattr(defect, "bottomInObj", getattr(defect, "bottomInImg", 0)) or 0),
+            left=int(defect.leftInObj or 0),
+            top=int(defect.topInObj or 0),
+            right=int(defect.rightInObj or 0),
+            bottom=int(defect.bottomInObj or 0),
         )
         return DefectRecord(
             defect_id=int(getattr(defect, "defectID", getattr(defect, "id", 0)) or 0),
@@ -104,7 +153,8 @@ class DefectService:
             class_id=getattr(defect, "defectClass", None),
             grade=getattr(defect, "grade", None),
             area=getattr(defect, "area", None),
-            bbox_image=bbox_img,
+            # *InImg 已弃用，帧内坐标统一以源图坐标返回。
+            bbox_image=bbox_src,
             bbox_source=bbox_src,
             bbox_object=bbox_obj,
         )
@@ -52,9 +52,12 @@ class ImageService:
         tile_ttl_seconds = ttl_seconds
         if image_settings.tile_prefetch_enabled:
             tile_ttl_seconds = max(tile_ttl_seconds, int(image_settings.tile_prefetch_ttl_seconds))
+        # 瓦片大小随级别/内容差异很大，除条数外再按编码后字节数封顶。
+        max_tile_bytes = memory_cache.max_tile_bytes
         self.tile_cache = TtlLruCache(
             max_items=_resolve_limit(memory_cache.max_tiles),
             ttl_seconds=tile_ttl_seconds,
+            max_bytes=max_tile_bytes if max_tile_bytes >= 0 else None,
         )
         self.mosaic_cache = TtlLruCache(
             max_items=_resolve_limit(memory_cache.max_mosaics),
@@ -1335,6 +1338,55 @@ class ImageService:
             ensure_meta=ensure_meta,
         )
 
+    def get_tile_file(
+        self,
+        surface: str,
+        seq_no: int,
+        *,
+        view: Optional[str] = None,
+        level: int = 0,
+        tile_x: int,
+        tile_y: int,
+        orientation: str = "vertical",
+        fmt: str = "JPEG",
+        viewer_id: Optional[str] = None,
+        prefetch: Optional[dict] = None,
+    ) -> Optional[Path]:
+        """
+        瓦片已落在磁盘缓存时直接返回文件路径，由接口层零拷贝发送；
+        未命中（或格式非 JPEG）返回 None，调用方回退到 get_tile。
+        """
+        if not self.disk_cache.enabled or fmt.upper() != "JPEG":
+            return None
+        orientation = (orientation or "vertical").lower()
+        if orientation not in {"horizontal", "vertical"} or level < 0:
+            return None
+        view_dir = view or self.settings.images.default_view
+        seq_no_fs = self._resolve_seq_no_for_fs(self._surface_root(surface), seq_no)
+        path = self.disk_cache.tile_path(
+            self._cache_root(surface),
+            seq_no_fs,
+            view=view_dir,
+            level=level,
+            orientation=orientation,
+            tile_x=tile_x,
+            tile_y=tile_y,
+        )
+        if not path.is_file():
+            return None
+        self._schedule_tile_prefetch(
+            viewer_id=(viewer_id or ""),
+            surface=surface,
+            seq_no=seq_no_fs,
+            view=view_dir,
+            level=level,
+            tile_x=tile_x,
+            tile_y=tile_y,
+            prefetch=prefetch,
+            orientation=orientation,
+        )
+        return path
+
     def _get_tile_impl(
         self,
         surface: str,
@@ -1404,7 +1456,9 @@ class ImageService:
         cache_key = (surface, seq_no, view_dir, orientation, level, tile_x, tile_y, fmt)
         data: Optional[bytes] = None
         if allow_cache:
-            if fmt.upper() == "JPEG":
+            # 先查内存中的已编码瓦片，平移/缩放时的重复请求无需再读盘。
+            data = self.tile_cache.get(cache_key)
+            if data is None and fmt.upper() == "JPEG":
                 disk = self.disk_cache.read_tile(
                     cache_root,
                     seq_no_fs,
@@ -1417,10 +1471,6 @@ class ImageService:
                 if disk is not None:
                     self.tile_cache.put(cache_key, disk)
                     data = disk
-            if data is None:
-                cached = self.tile_cache.get(cache_key)
-                if cached is not None:
-                    data = cached
 
         def _tile_grid(level_value: int) -> tuple[int, int]:
             count = _resolve_frame_count()
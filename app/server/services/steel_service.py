@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Iterable, Optional
+from functools import lru_cache
+from typing import Iterable, Iterator, Optional
 
-from sqlalchemy import func
+from sqlalchemy import and_, bindparam, or_, select
 from sqlalchemy.orm import Session
 
+from ..cache import TtlLruCache
 from ..db.models.source.ncdplate import Rcvsteelprop, Steelrecord
 from ..schemas import SteelListResponse, SteelRecord
 
@@ -19,6 +21,61 @@ def _coerce_int(value):
         return None
 
 
+# 列表首页（不带 start_seq）会随新钢板到达而变化，只做极短缓存合并并发刷新；
+# 带游标的翻页、按流水号/钢板号/时间段的查询对应已落库的历史数据，可缓存更久。
+HEAD_CACHE_TTL_SECONDS = 2
+HISTORY_CACHE_TTL_SECONDS = 30
+
+# 按时间段导出时每批读取的行数：内存占用只与批大小相关，与时间窗口长度无关。
+DATE_EXPORT_BATCH_SIZE = 1000
+
+# 固定形状的查询语句在模块级构建一次：语句对象与其缓存键只生成一次，
+# 执行时由引擎的编译缓存直接命中，省去每个请求重新构建 Query 的开销。
+_BY_SEQ = (
+    select(Steelrecord)
+    .where(Steelrecord.seqNo == bindparam("seq_no"))
+    .order_by(Steelrecord.id.desc())
+)
+_BY_ID = (
+    select(Steelrecord)
+    .where(Steelrecord.id == bindparam("steel_id"))
+    .order_by(Steelrecord.id.desc())
+)
+_BY_STEEL_NO = (
+    select(Steelrecord)
+    .where(Steelrecord.steelID.like(bindparam("pattern")))
+    .order_by(Steelrecord.seqNo.desc())
+)
+_BY_DATE = (
+    select(Steelrecord)
+    .where(Steelrecord.detectTime >= bindparam("start"), Steelrecord.detectTime <= bindparam("end"))
+    .order_by(Steelrecord.seqNo.desc(), Steelrecord.id.desc())
+)
+# 导出用的键集分页：按 (seqNo, ID) 倒序，每批以上一批最后一行的 (seqNo, ID) 为游标。
+# SeqNo 可能重复，只用 seqNo 作游标会丢掉跨批边界的同号记录；ID 唯一，二者组合是全序。
+# 行值比较 (a, b) < (x, y) 在 SQL Server 上不可用，这里展开为等价的 OR/AND，仍可走 (SeqNo, ID) 索引。
+# 不依赖服务端游标（MySQL 流式游标期间同连接无法再查询 rcvsteelprop）。
+_BY_DATE_FIRST_PAGE = _BY_DATE.limit(DATE_EXPORT_BATCH_SIZE)
+_BY_DATE_NEXT_PAGE = _BY_DATE.where(
+    or_(
+        Steelrecord.seqNo < bindparam("before_seq"),
+        and_(Steelrecord.seqNo == bindparam("before_seq"), Steelrecord.id < bindparam("before_id")),
+    )
+).limit(DATE_EXPORT_BATCH_SIZE)
+_PROPS_BY_STEEL_ID = select(Rcvsteelprop).where(Rcvsteelprop.steelID.in_(bindparam("steel_ids", expanding=True)))
+
+
+@lru_cache(maxsize=None)
+def _list_recent_stmt(desc: bool, has_start: bool, defect_only: bool):
+    stmt = select(Steelrecord)
+    if has_start:
+        start = bindparam("start_seq")
+        stmt = stmt.where(Steelrecord.seqNo > start if desc else Steelrecord.seqNo < start)
+    if defect_only:
+        stmt = stmt.where(Steelrecord.defectNum.isnot(None), Steelrecord.defectNum > 0)
+    return stmt.order_by(Steelrecord.seqNo.desc() if desc else Steelrecord.seqNo.asc())
+
+
 class SteelService:
     """
     SQLAlchemy 驱动的钢板查询服务，直接连接 ncdhotstrip 数据库。
@@ -29,6 +86,22 @@ class SteelService:
         :param session_factory: callable returning sqlalchemy.orm.Session
         """
         self.session_factory = session_factory
+        self._head_cache: TtlLruCache[tuple, SteelListResponse] = TtlLruCache(
+            max_items=64, ttl_seconds=HEAD_CACHE_TTL_SECONDS
+        )
+        self._history_cache: TtlLruCache[tuple, SteelListResponse] = TtlLruCache(
+            max_items=512, ttl_seconds=HISTORY_CACHE_TTL_SECONDS
+        )
+
+    def _cached(self, cache: TtlLruCache, key: tuple, load) -> SteelListResponse:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+        result = load()
+        # 空结果不缓存：钢板可能尚未写入，稍后重试应能立即查到。
+        if result.count:
+            cache.put(key, result)
+        return result
 
     def list_recent(
         self,
@@ -37,62 +110,68 @@ class SteelService:
         start_seq: Optional[int],
         desc: bool,
     ) -> SteelListResponse:
-        with self.session_factory() as session:
-            order_field = Steelrecord.seqNo.desc() if desc else Steelrecord.seqNo.asc()
-            query = session.query(Steelrecord)
-            if start_seq is not None:
-                query = query.filter(Steelrecord.seqNo > start_seq) if desc else query.filter(
-                    Steelrecord.seqNo < start_seq
-                )
-            if defect_only:
-                query = query.filter(Steelrecord.defectNum.isnot(None)).filter(Steelrecord.defectNum > 0)
+        cache = self._head_cache if start_seq is None else self._history_cache
+        key = ("recent", limit, defect_only, start_seq, desc)
+        return self._cached(cache, key, lambda: self._list_recent(limit, defect_only, start_seq, desc))
 
-            records = query.order_by(order_field).limit(limit).all()
+    def _list_recent(
+        self,
+        limit: int,
+        defect_only: bool,
+        start_seq: Optional[int],
+        desc: bool,
+    ) -> SteelListResponse:
+        with self.session_factory() as session:
+            stmt = _list_recent_stmt(desc, start_seq is not None, defect_only).limit(limit)
+            params = {"start_seq": start_seq} if start_seq is not None else {}
+            records = session.execute(stmt, params).scalars().all()
 
             items = self._map_records(session, records, limit)
             return SteelListResponse(count=len(items), items=items)
 
     def by_seq(self, seq_no: int) -> SteelListResponse:
-        with self.session_factory() as session:
-            records = (
-                session.query(Steelrecord)
-                .filter(Steelrecord.seqNo == seq_no)
-                .order_by(Steelrecord.id.desc())
-                .all()
-            )
-            items = self._map_records(session, records, None)
-            return SteelListResponse(count=len(items), items=items)
+        return self._cached(self._history_cache, ("seq", seq_no), lambda: self._query(_BY_SEQ, {"seq_no": seq_no}))
 
     def by_id(self, steel_id: int) -> SteelListResponse:
-        with self.session_factory() as session:
-            records = (
-                session.query(Steelrecord)
-                .filter(Steelrecord.id == steel_id)
-                .order_by(Steelrecord.id.desc())
-                .all()
-            )
-            items = self._map_records(session, records, None)
-            return SteelListResponse(count=len(items), items=items)
+        return self._cached(self._history_cache, ("id", steel_id), lambda: self._query(_BY_ID, {"steel_id": steel_id}))
 
     def by_steel_no(self, steel_no: str) -> SteelListResponse:
-        with self.session_factory() as session:
-            records = (
-                session.query(Steelrecord)
-                .filter(Steelrecord.steelID.like(f"%{steel_no}%"))
-                .order_by(Steelrecord.seqNo.desc())
-                .all()
-            )
-            items = self._map_records(session, records, None)
-            return SteelListResponse(count=len(items), items=items)
+        # 模糊匹配可能命中仍在到达的新钢板，按首页策略短缓存。
+        return self._cached(
+            self._head_cache,
+            ("steel_no", steel_no),
+            lambda: self._query(_BY_STEEL_NO, {"pattern": f"%{steel_no}%"}),
+        )
 
     def by_date(self, start: datetime, end: datetime) -> SteelListResponse:
+        return self._cached(
+            self._head_cache,
+            ("date", start, end),
+            lambda: self._query(_BY_DATE, {"start": start, "end": end}),
+        )
+
+    def iter_by_date(self, start: datetime, end: datetime) -> Iterator[list[SteelRecord]]:
+        """
+        按时间段分批返回钢板记录（每批至多 DATE_EXPORT_BATCH_SIZE 条），供流式导出使用。
+        """
+        params: dict = {"start": start, "end": end}
+        stmt = _BY_DATE_FIRST_PAGE
+        while True:
+            with self.session_factory() as session:
+                records = session.execute(stmt, params).scalars().all()
+                if not records:
+                    return
+                items = self._map_records(session, records, None)
+            yield items
+            if len(records) < DATE_EXPORT_BATCH_SIZE:
+                return
+            stmt = _BY_DATE_NEXT_PAGE
+            last = records[-1]
+            params = {"start": start, "end": end, "before_seq": last.seqNo, "before_id": last.id}
+
+    def _query(self, stmt, params: dict) -> SteelListResponse:
         with self.session_factory() as session:
-            records = (
-                session.query(Steelrecord)
-                .filter(Steelrecord.detectTime >= start, Steelrecord.detectTime <= end)
-                .order_by(Steelrecord.seqNo.desc())
-                .all()
-            )
+            records = session.execute(stmt, params).scalars().all()
             items = self._map_records(session, records, None)
             return SteelListResponse(count=len(items), items=items)
 
@@ -139,7 +218,7 @@ class SteelService:
         steel_ids = {rec.steelID for rec in records if rec.steelID}
         if not steel_ids:
             return {}
-        props = session.query(Rcvsteelprop).filter(Rcvsteelprop.steelID.in_(steel_ids)).all()
+        props = session.execute(_PROPS_BY_STEEL_ID, {"steel_ids": list(steel_ids)}).scalars().all()
         return {prop.steelID: prop for prop in props}
 
     def _to_model(self, steel_obj: Steelrecord, extra: Optional[Rcvsteelprop]) -> SteelRecord:
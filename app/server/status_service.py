@@ -163,6 +163,21 @@ class StatusService:
                 for item in self._services.values()
             ]
 
+    def get_service(self, name: str) -> dict[str, Any] | None:
+        with self._lock:
+            item = self._services.get(name)
+            if item is None:
+                return None
+            return {
+                "name": item.get("name"),
+                "label": item.get("label"),
+                "priority": item.get("priority"),
+                "state": item.get("state"),
+                "message": item.get("message"),
+                "data": item.get("data") or {},
+                "updated_at": item.get("updated_at"),
+            }
+
     def get_logs(self, name: str | None, *, cursor: int = 0, limit: int = 200) -> dict[str, Any]:
         with self._lock:
             if name and name != "all":
@@ -499,9 +499,9 @@ def _insert_defects(
         session.execute(text("DELETE FROM camdefect2 WHERE seqNo = :seq_no"), {"seq_no": seq_no})
         session.execute(text("DELETE FROM camdefectsum1 WHERE seqNo = :seq_no"), {"seq_no": seq_no})
         session.execute(text("DELETE FROM camdefectsum2 WHERE seqNo = :seq_no"), {"seq_no": seq_no})
-        class_counts_top: dict[int, int] = {}
-        class_counts_bottom: dict[int, int] = {}
-        for surface_table, class_counts in (("camdefect1", class_counts_top), ("camdefect2", class_counts_bottom)):
+        for surface_table, sum_table in (("camdefect1", "camdefectsum1"), ("camdefect2", "camdefectsum2")):
+            rows: list[dict[str, Any]] = []
+            class_counts: dict[int, int] = {}
             for idx in range(defect_count):
                 defect_class = random.randint(1, 10)
                 left = random.randint(0, max(0, frame_width - 200))
@@ -511,19 +511,7 @@ def _insert_defects(
                 img_index = None
                 if img_index_max is not None:
                     img_index = img_index_latest
-                session.execute(
-                    text(
-                        f"""
-                        INSERT INTO {surface_table}
-                        (defectID, camNo, seqNo, imgIndex, defectClass, leftInImg, rightInImg, topInImg, bottomInImg,
-                         leftInSrcImg, rightInSrcImg, topInSrcImg, bottomInSrcImg, leftInObj, rightInObj, topInObj, bottomInObj,
-                         grade, area, leftToEdge, rightToEdge, cycle)
-                        VALUES
-                        (:defect_id, :cam_no, :seq_no, :img_index, :defect_class, :left_img, :right_img, :top_img, :bottom_img,
-                         :left_src, :right_src, :top_src, :bottom_src, :left_obj, :right_obj, :top_obj, :bottom_obj,
-                         :grade, :area, :left_edge, :right_edge, :cycle)
-                        """
-                    ),
+                rows.append(
                     {
                         "defect_id": idx + 1,
                         "cam_no": 1 if surface_table == "camdefect1" else 2,
@@ -547,18 +535,28 @@ def _insert_defects(
                         "left_edge": left,
                         "right_edge": frame_width - right,
                         "cycle": 0,
-                    },
+                    }
                 )
                 class_counts[defect_class] = class_counts.get(defect_class, 0) + 1
-        for cls, count in class_counts_top.items():
+            # 整板缺陷与分类汇总各用一次 executemany 写入，汇总在内存中累计，无需回表 GROUP BY。
             session.execute(
-                text("INSERT INTO camdefectsum1 (seqNo, defectClass, defectNum) VALUES (:seq_no, :cls, :count)"),
-                {"seq_no": seq_no, "cls": cls, "count": count},
+                text(
+                    f"""
+                    INSERT INTO {surface_table}
+                    (defectID, camNo, seqNo, imgIndex, defectClass, leftInImg, rightInImg, topInImg, bottomInImg,
+                     leftInSrcImg, rightInSrcImg, topInSrcImg, bottomInSrcImg, leftInObj, rightInObj, topInObj, bottomInObj,
+                     grade, area, leftToEdge, rightToEdge, cycle)
+                    VALUES
+                    (:defect_id, :cam_no, :seq_no, :img_index, :defect_class, :left_img, :right_img, :top_img, :bottom_img,
+                     :left_src, :right_src, :top_src, :bottom_src, :left_obj, :right_obj, :top_obj, :bottom_obj,
+                     :grade, :area, :left_edge, :right_edge, :cycle)
+                    """
+                ),
+                rows,
             )
-        for cls, count in class_counts_bottom.items():
             session.execute(
-                text("INSERT INTO camdefectsum2 (seqNo, defectClass, defectNum) VALUES (:seq_no, :cls, :count)"),
-                {"seq_no": seq_no, "cls": cls, "count": count},
+                text(f"INSERT INTO {sum_table} (seqNo, defectClass, defectNum) VALUES (:seq_no, :cls, :count)"),
+                [{"seq_no": seq_no, "cls": cls, "count": count} for cls, count in class_counts.items()],
             )
         session.commit()
     finally:
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import pytest
+from starlette.requests import Request
+
+from app.server.api.images import _parse_byte_range, _ranged_response
+
+PAYLOAD = bytes(range(100))
+ETAG = '"tile-1"'
+
+
+def _request(**headers: str) -> Request:
+    raw = [(name.replace("_", "-").encode("latin-1"), value.encode("latin-1")) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ("bytes=0-9", (0, 9)),
+        ("bytes=90-", (90, 99)),
+        ("bytes=95-200", (95, 99)),
+        ("bytes=-10", (90, 99)),
+        ("bytes=-500", (0, 99)),
+        ("bytes=100-", (100, 99)),
+        ("bytes=150-200", (150, 99)),
+    ],
+)
+def test_parse_byte_range(header, expected):
+    assert _parse_byte_range(header, 100) == expected
+
+
+@pytest.mark.parametrize(
+    "header",
+    ["items=0-9", "bytes=0-9,20-29", "bytes=abc", "bytes=a-b", "bytes=-0", "bytes=9-0", "bytes=-"],
+)
+def test_parse_byte_range_rejects_unsupported(header):
+    assert _parse_byte_range(header, 100) is None
+
+
+def test_ranged_response_returns_partial_content():
+    response = _ranged_response(_request(range="bytes=10-19"), PAYLOAD, "image/jpeg", {"ETag": ETAG})
+
+    assert response.status_code == 206
+    assert response.body == PAYLOAD[10:20]
+    assert response.headers["content-range"] == "bytes 10-19/100"
+    assert response.headers["accept-ranges"] == "bytes"
+
+
+def test_ranged_response_suffix_range():
+    response = _ranged_response(_request(range="bytes=-5"), PAYLOAD, "image/jpeg", {"ETag": ETAG})
+
+    assert response.status_code == 206
+    assert response.body == PAYLOAD[95:]
+    assert response.headers["content-range"] == "bytes 95-99/100"
+
+
+def test_ranged_response_unsatisfiable_range():
+    response = _ranged_response(_request(range="bytes=100-"), PAYLOAD, "image/jpeg", {"ETag": ETAG})
+
+    assert response.status_code == 416
+    assert response.headers["content-range"] == "bytes */100"
+    assert response.body == b""
+
+
+def test_ranged_response_without_range_returns_full_body():
+    response = _ranged_response(_request(), PAYLOAD, "image/jpeg", {"ETag": ETAG})
+
+    assert response.status_code == 200
+    assert response.body == PAYLOAD
+    assert response.headers["accept-ranges"] == "bytes"
+
+
+def test_ranged_response_honours_matching_if_range():
+    request = _request(range="bytes=0-3", if_range=ETAG)
+    response = _ranged_response(request, PAYLOAD, "image/jpeg", {"ETag": ETAG})
+
+    assert response.status_code == 206
+    assert response.body == PAYLOAD[:4]
+
+
+def test_ranged_response_stale_if_range_returns_full_body():
+    request = _request(range="bytes=0-3", if_range='"tile-0"')
+    response = _ranged_response(request, PAYLOAD, "image/jpeg", {"ETag": ETAG})
+
+    assert response.status_code == 200
+    assert response.body == PAYLOAD
+    assert "content-range" not in response.headers
+
+
+def test_ranged_response_ignores_multi_range():
+    response = _ranged_response(_request(range="bytes=0-1,5-6"), PAYLOAD, "image/jpeg", {"ETag": ETAG})
+
+    assert response.status_code == 200
+    assert response.body == PAYLOAD
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from sqlalchemy import inspect, text
+
+from app.server import database
+from app.server.config.settings import DatabaseSettings
+from app.server.rbac import manager
+
+
+def _settings(**database_fields) -> SimpleNamespace:
+    return SimpleNamespace(database=DatabaseSettings(management_database="mgmt", **database_fields))
+
+
+def test_initialize_management_database_binds_named_database_on_server(monkeypatch):
+    """MySQL 下建表不能走 URL 不含库名的共享引擎，否则 has_table(schema=None) 断言失败。"""
+    settings = _settings(drive="mysql", host="db.example", password="secret")
+    binds = []
+    monkeypatch.setattr(manager, "ensure_database_exists", lambda *args, **kwargs: None)
+    monkeypatch.setattr(
+        manager.rbac_models.Base.metadata,
+        "create_all",
+        lambda bind, checkfirst=True: binds.append(bind),
+    )
+
+    manager.initialize_management_database(settings)
+
+    assert len(binds) == 1
+    bind = binds[0]
+    assert bind.dialect.name == "mysql"
+    assert bind.url.database == "mgmt"
+
+
+def test_registry_binds_one_engine_per_database():
+    """每个库一个连接池，URL 带库名，反射与 default_schema_name 都指向该库。"""
+    settings = _settings(drive="mysql", host="db.example", password="secret", database_type="ncdplate", pool_size=7)
+    registry = database.get_session_registry(settings)
+
+    binds = [registry.main.kw["bind"], registry.defect.kw["bind"], registry.management.kw["bind"]]
+
+    assert [bind.url.database for bind in binds] == ["ncdplate", "ncdplatedefect", "mgmt"]
+    assert len({id(bind) for bind in binds}) == 3
+    assert all(bind.pool.size() == 7 for bind in binds)
+
+
+def test_main_and_defect_sessions_query_their_own_database(tmp_path):
+    for db_name in ("ncdplate", "ncdplatedefect"):
+        with database.database_ddl_engine(DatabaseSettings(drive="sqlite", sqlite_dir=tmp_path), db_name) as engine:
+            with engine.begin() as connection:
+                connection.execute(text("CREATE TABLE marker (name VARCHAR(32))"))
+                connection.execute(text("INSERT INTO marker VALUES (:name)"), {"name": db_name})
+    settings = _settings(drive="sqlite", sqlite_dir=tmp_path, database_type="ncdplate")
+    registry = database.get_session_registry(settings)
+
+    # 交替访问两个库，确认不会串库
+    for _ in range(2):
+        with registry.main() as session:
+            assert session.execute(text("SELECT name FROM marker")).scalar_one() == "ncdplate"
+        with registry.defect() as session:
+            assert session.execute(text("SELECT name FROM marker")).scalar_one() == "ncdplatedefect"
+
+
+def test_initialize_management_database_creates_tables_sqlite(tmp_path):
+    settings = _settings(drive="sqlite", sqlite_dir=tmp_path)
+
+    manager.initialize_management_database(settings)
+    # 再次执行走 checkfirst，不应报错
+    manager.initialize_management_database(settings)
+
+    with database.database_ddl_engine(settings.database, "mgmt") as engine:
+        tables = set(inspect(engine).get_table_names())
+    assert {"users", "roles", "user_roles", "config_entries"} <= tables
+
+
+def test_bootstrap_management_seeds_admin_and_policy(tmp_path):
+    settings = _settings(drive="sqlite", sqlite_dir=tmp_path)
+    session = database.get_management_session(settings)
+    try:
+        manager.bootstrap_management(settings, session)
+        assert manager.validate_login(session, "admin", "Nercar701") is not None
+    finally:
+        session.close()
+
+    with database.database_ddl_engine(settings.database, "mgmt") as engine:
+        assert "casbin_rule" in inspect(engine).get_table_names()
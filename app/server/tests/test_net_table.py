@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import orjson
+
+from app.server import net_table
+
+
+def _write_template(path):
+    path.write_bytes(
+        orjson.dumps(
+            {
+                "database": {"host": "{ip}", "port": 3306},
+                "images": {"top_root": "//127.0.0.1/top", "frame_width": 16384},
+                "cache": {},
+                "log": {},
+            }
+        )
+    )
+
+
+def test_build_configs_generates_each_line_view_in_order(tmp_path, monkeypatch):
+    monkeypatch.setattr(net_table, "GENERATED_ROOT", tmp_path / "generated")
+    template = tmp_path / "server.json"
+    _write_template(template)
+    lines = [
+        {"key": "L1", "ip": "10.0.0.1", "images": {"frame_width": 8192}},
+        {"key": "L2", "ip": "10.0.0.2"},
+    ]
+    jobs = [
+        (line, template, view, {"mode": view.lower()}, None)
+        for line in lines
+        for view in ("2D", "SMALL")
+    ]
+
+    paths = net_table.build_configs(jobs)
+
+    assert paths == [
+        tmp_path / "generated" / key / view / "server.json"
+        for key in ("L1", "L2")
+        for view in ("2D", "SMALL")
+    ]
+    first = orjson.loads(paths[0].read_bytes())
+    assert first["database"]["host"] == "10.0.0.1"
+    assert first["images"]["top_root"] == "//10.0.0.1/top"
+    assert first["images"]["frame_width"] == 8192
+    assert first["images"]["default_view"] == "2D"
+    last = orjson.loads(paths[-1].read_bytes())
+    assert last["database"]["host"] == "10.0.0.2"
+    assert last["images"]["frame_width"] == 16384
+    assert last["images"]["mode"] == "small"
+    # 共享的产线配置不会被合并过程修改
+    assert lines[0] == {"key": "L1", "ip": "10.0.0.1", "images": {"frame_width": 8192}}
+
+
+def test_build_configs_empty():
+    assert net_table.build_configs([]) == []
+
+
+def test_apply_ip_format_substitutes_placeholder_or_loopback():
+    # 含 {ip} 时只替换占位符，回环地址保持不变；不含时才替换 127.0.0.1
+    assert net_table._apply_ip_format("{ip}:3306 via 127.0.0.1", "10.0.0.9") == "10.0.0.9:3306 via 127.0.0.1"
+    assert net_table._apply_ip_format("//127.0.0.1/top", "10.0.0.9") == "//10.0.0.9/top"
+    assert net_table._apply_ip_format("//{ip}/{ip}", "10.0.0.9") == "//10.0.0.9/10.0.0.9"
+    assert net_table._apply_ip_format("D:/images", "10.0.0.9") == "D:/images"
+    assert net_table._apply_ip_format("{ip}", None) == "{ip}"
+    assert net_table._apply_ip_format(3306, "10.0.0.9") == 3306
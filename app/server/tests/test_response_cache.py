@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.server.cache.response_cache import MAX_CACHED_BODY_BYTES, ResponseCacheMiddleware
+
+
+def _make_client(ttl_by_path: dict[str, int]) -> tuple[TestClient, dict[str, int]]:
+    calls = {"count": 0}
+    app = FastAPI()
+
+    @app.get("/api/steels")
+    def steels(limit: int = 10):
+        calls["count"] += 1
+        return {"limit": limit, "call": calls["count"]}
+
+    @app.post("/api/steels")
+    def create_steel():
+        calls["count"] += 1
+        return {"call": calls["count"]}
+
+    @app.get("/api/steels/extra")
+    def steels_extra():
+        calls["count"] += 1
+        return {"call": calls["count"]}
+
+    @app.get("/api/meta/{name}")
+    def meta(name: str):
+        calls["count"] += 1
+        return {"name": name, "call": calls["count"]}
+
+    @app.get("/api/missing")
+    def missing():
+        calls["count"] += 1
+        return JSONResponse({"call": calls["count"]}, status_code=404)
+
+    @app.get("/api/pending")
+    def pending(response: Response):
+        calls["count"] += 1
+        response.headers["Cache-Control"] = "no-store"
+        return {"items": []}
+
+    @app.get("/api/large")
+    def large():
+        calls["count"] += 1
+        return Response(b"x" * (MAX_CACHED_BODY_BYTES + 1), media_type="application/octet-stream")
+
+    @app.get("/api/stream")
+    def stream():
+        calls["count"] += 1
+        return StreamingResponse(iter([b"a", b"b"]), media_type="text/plain")
+
+    app.add_middleware(ResponseCacheMiddleware, ttl_by_path=ttl_by_path)
+    return TestClient(app), calls
+
+
+def test_repeated_get_is_served_from_cache():
+    client, calls = _make_client({"/api/steels": 60})
+
+    first = client.get("/api/steels")
+    second = client.get("/api/steels")
+
+    assert calls["count"] == 1
+    assert second.status_code == 200
+    assert second.json() == first.json()
+    assert second.headers["content-type"] == first.headers["content-type"]
+
+
+def test_query_string_is_part_of_the_key():
+    client, calls = _make_client({"/api/steels": 60})
+
+    assert client.get("/api/steels?limit=5").json()["limit"] == 5
+    assert client.get("/api/steels?limit=6").json()["limit"] == 6
+    client.get("/api/steels?limit=5")
+
+    assert calls["count"] == 2
+
+
+def test_exact_key_does_not_match_sub_paths():
+    client, calls = _make_client({"/api/steels": 60})
+
+    client.get("/api/steels/extra")
+    client.get("/api/steels/extra")
+
+    assert calls["count"] == 2
+
+
+def test_trailing_slash_key_matches_by_prefix():
+    client, calls = _make_client({"/api/meta/": 60})
+
+    client.get("/api/meta/a")
+    client.get("/api/meta/a")
+    assert calls["count"] == 1
+
+    assert client.get("/api/meta/b").json()["name"] == "b"
+    assert calls["count"] == 2
+
+
+def test_post_is_never_cached():
+    client, calls = _make_client({"/api/steels": 60})
+
+    client.post("/api/steels")
+    client.post("/api/steels")
+
+    assert calls["count"] == 2
+
+
+def test_non_200_responses_are_not_cached():
+    client, calls = _make_client({"/api/missing": 60})
+
+    assert client.get("/api/missing").status_code == 404
+    assert client.get("/api/missing").status_code == 404
+    assert calls["count"] == 2
+
+
+def test_no_store_response_is_not_cached():
+    client, calls = _make_client({"/api/pending": 60})
+
+    client.get("/api/pending")
+    client.get("/api/pending")
+
+    assert calls["count"] == 2
+
+
+def test_oversized_body_is_not_cached():
+    client, calls = _make_client({"/api/large": 60})
+
+    client.get("/api/large")
+    client.get("/api/large")
+
+    assert calls["count"] == 2
+
+
+def test_chunked_body_is_not_cached():
+    client, calls = _make_client({"/api/stream": 60})
+
+    assert client.get("/api/stream").text == "ab"
+    assert client.get("/api/stream").text == "ab"
+    assert calls["count"] == 2
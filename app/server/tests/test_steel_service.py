@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.server.db.models.source.ncdplate import Steelrecord
+from app.server.services import steel_service
+from app.server.services.steel_service import SteelService
+
+
+def _service_with_rows(seq_numbers: list[int]) -> SteelService:
+    engine = create_engine("sqlite+pysqlite:///:memory:", future=True)
+    # 模型中的 MySQL TINYINT 无法在 SQLite 上建表，这里只建测试用到的列（与 TestData 备份库一致）
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "CREATE TABLE steelrecord (ID INTEGER PRIMARY KEY, SeqNo INTEGER NOT NULL, SteelID VARCHAR(64), "
+                "SteelType VARCHAR(32), SteelLen INTEGER, Width INTEGER, Thick SMALLINT, DefectNum SMALLINT, "
+                "DetectTime DATETIME, Grade SMALLINT, warn SMALLINT, steelOut SMALLINT, cycle SMALLINT, "
+                "client VARCHAR(64))"
+            )
+        )
+        connection.execute(
+            text(
+                "CREATE TABLE rcvsteelprop (ID INTEGER PRIMARY KEY, SteelID VARCHAR(64), SteelType VARCHAR(32), "
+                "Width INTEGER, Thick INTEGER, Len INTEGER, AddTime DATETIME, Used INTEGER)"
+            )
+        )
+    factory = sessionmaker(bind=engine, future=True)
+    base_time = datetime(2026, 1, 1, 8, 0, 0)
+    with factory() as session:
+        session.add_all(
+            Steelrecord(seqNo=seq_no, steelID=f"S{index}", detectTime=base_time + timedelta(seconds=index))
+            for index, seq_no in enumerate(seq_numbers)
+        )
+        session.commit()
+    return SteelService(factory)
+
+
+def test_iter_by_date_keeps_duplicate_seq_across_batch_boundary():
+    batch = steel_service.DATE_EXPORT_BATCH_SIZE
+    # seqNo batch..2 各一条，seqNo=1 两条：按 (seqNo, ID) 倒序时两条 1 号恰好分在第一批末尾与第二批开头
+    seq_numbers = list(range(1, batch + 1)) + [1]
+    service = _service_with_rows(seq_numbers)
+
+    batches = list(service.iter_by_date(datetime(2026, 1, 1), datetime(2026, 1, 2)))
+
+    assert [len(items) for items in batches] == [batch, 1]
+    exported = [item.seq_no for items in batches for item in items]
+    assert sorted(exported) == sorted(seq_numbers)
+    assert exported == sorted(exported, reverse=True)
+    assert len({item.steel_id for items in batches for item in items}) == len(seq_numbers)
+
+
+def test_iter_by_date_empty_window():
+    service = _service_with_rows([1, 2, 3])
+    assert list(service.iter_by_date(datetime(2025, 1, 1), datetime(2025, 1, 2))) == []
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import pytest
+
+from app.server.cache import TtlLruCache
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_evicts_least_recently_used_when_over_byte_cap():
+    cache: TtlLruCache[str, bytes] = TtlLruCache(max_items=100, max_bytes=10)
+    cache.put("a", b"1234")
+    cache.put("b", b"1234")
+    assert cache.get("a") == b"1234"  # a 变为最近使用
+    cache.put("c", b"1234")  # 12 > 10：淘汰最久未使用的 b
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1234"
+    assert cache.get("c") == b"1234"
+    assert cache._total_bytes == 8
+
+
+def test_value_larger_than_cap_is_not_stored():
+    cache: TtlLruCache[str, bytes] = TtlLruCache(max_items=100, max_bytes=4)
+    cache.put("small", b"12")
+    cache.put("huge", b"12345")
+
+    assert cache.get("huge") is None
+    assert cache.get("small") == b"12"
+    assert cache._total_bytes == 2
+
+
+def test_oversized_replacement_drops_the_stale_value():
+    cache: TtlLruCache[str, bytes] = TtlLruCache(max_items=100, max_bytes=4)
+    cache.put("a", b"12")
+    cache.put("a", b"12345")
+
+    assert cache.get("a") is None
+    assert cache._total_bytes == 0
+
+
+def test_replacing_a_key_updates_accounting():
+    cache: TtlLruCache[str, bytes] = TtlLruCache(max_items=100, max_bytes=10)
+    cache.put("a", b"12345678")
+    cache.put("a", b"12")
+    cache.put("b", b"12345678")
+
+    assert cache.get("a") == b"12"
+    assert cache.get("b") == b"12345678"
+    assert cache._total_bytes == 10
+
+
+def test_expired_entries_release_their_bytes():
+    clock = _Clock()
+    cache: TtlLruCache[str, bytes] = TtlLruCache(max_items=100, ttl_seconds=5, max_bytes=10, time_fn=clock)
+    cache.put("a", b"12345678")
+    clock.now = 6
+    assert cache.get("a") is None
+    assert cache._total_bytes == 0
+
+    cache.put("b", b"12345678")
+    assert cache.get("b") == b"12345678"
+
+
+def test_item_cap_still_applies_with_byte_cap():
+    cache: TtlLruCache[int, bytes] = TtlLruCache(max_items=2, max_bytes=1000)
+    for key in range(3):
+        cache.put(key, b"x")
+
+    assert len(cache) == 2
+    assert cache.get(0) is None
+    assert cache._total_bytes == 2
+
+
+def test_clear_resets_accounting():
+    cache: TtlLruCache[str, bytes] = TtlLruCache(max_items=10, max_bytes=10)
+    cache.put("a", b"1234")
+    cache.clear()
+
+    assert len(cache) == 0
+    assert cache._total_bytes == 0
+
+
+def test_without_byte_cap_values_need_not_be_sized():
+    cache: TtlLruCache[str, object] = TtlLruCache(max_items=2)
+    value = object()  # 没有 len()：未设置 max_bytes 时不应调用 size_fn
+    cache.put("a", value)
+    assert cache.get("a") is value
+
+
+@pytest.mark.parametrize("kwargs", [{"max_items": 0}, {"ttl_seconds": 0}])
+def test_rejects_invalid_limits(kwargs):
+    with pytest.raises(ValueError):
+        TtlLruCache(**kwargs)
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import gzip
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.server.config_center import UiStaticFiles
+from app.server.utils.precompress_ui import precompress_ui_assets
+
+
+def _client(tmp_path) -> TestClient:
+    body = b"\0asm" + b"x" * 4096
+    (tmp_path / "DefectWebUi.wasm").write_bytes(body)
+    (tmp_path / "DefectWebUi.wasm.gz").write_bytes(gzip.compress(body, mtime=0))
+    app = FastAPI()
+    app.mount("/ui", UiStaticFiles(directory=tmp_path, check_dir=False), name="ui")
+    return TestClient(app)
+
+
+def test_precompressed_sidecar_is_served(tmp_path):
+    client = _client(tmp_path)
+    response = client.get("/ui/DefectWebUi.wasm", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["cache-control"] == "no-cache"
+    assert response.content.startswith(b"\0asm")
+
+
+def test_precompressed_sidecar_revalidates_with_304(tmp_path):
+    client = _client(tmp_path)
+    first = client.get("/ui/DefectWebUi.wasm", headers={"Accept-Encoding": "gzip"})
+    etag = first.headers["etag"]
+
+    by_etag = client.get(
+        "/ui/DefectWebUi.wasm", headers={"Accept-Encoding": "gzip", "If-None-Match": etag}
+    )
+    assert by_etag.status_code == 304
+    assert by_etag.content == b""
+    assert by_etag.headers["etag"] == etag
+
+    by_date = client.get(
+        "/ui/DefectWebUi.wasm",
+        headers={"Accept-Encoding": "gzip", "If-Modified-Since": first.headers["last-modified"]},
+    )
+    assert by_date.status_code == 304
+
+
+def test_identity_request_skips_sidecar(tmp_path):
+    client = _client(tmp_path)
+    response = client.get("/ui/DefectWebUi.wasm", headers={"Accept-Encoding": "identity"})
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+
+
+def test_precompress_ui_assets_writes_fresh_sidecars_once(tmp_path):
+    body = b"\0asm" + b"x" * 4096
+    (tmp_path / "DefectWebUi.wasm").write_bytes(body)
+    (tmp_path / "qtloader.js").write_bytes(b"tiny")  # 小于 1 KiB，不压缩
+    (tmp_path / "logo.png").write_bytes(b"p" * 4096)  # 非文本/WASM 资源，不压缩
+
+    generated = precompress_ui_assets(tmp_path)
+
+    sidecars = {path.name for path in tmp_path.iterdir() if path.suffix in (".gz", ".br")}
+    assert generated == len(sidecars) >= 1
+    assert "DefectWebUi.wasm.gz" in sidecars
+    assert all(name.startswith("DefectWebUi.wasm.") for name in sidecars)
+    assert gzip.decompress((tmp_path / "DefectWebUi.wasm.gz").read_bytes()) == body
+    # 旁路文件已是最新时不重复生成
+    assert precompress_ui_assets(tmp_path) == 0
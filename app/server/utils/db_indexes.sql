@@ -0,0 +1,51 @@
+-- 存量数据库的索引补丁（MySQL / SQL Server 通用语法）。
+--
+-- ORM 模型中声明的索引只会在 create_all 新建表时生效：源数据库（ncdplate 等）由检测系统建表，
+-- 本服务从不建表；管理库的已有表 create_all(checkfirst=True) 也不会修改。
+-- 部署或升级时按数据库分别执行对应小节；索引已存在（或旧索引已删除）时语句会报错，跳过该条即可。
+
+-- ---------------------------------------------------------------------------
+-- 源数据库（database.database_type，默认 ncdplate）
+-- ---------------------------------------------------------------------------
+
+-- 钢板列表 / 按流水号翻页 / 导出游标：WHERE SeqNo ... ORDER BY SeqNo, ID
+CREATE INDEX ix_steelrecord_seqno_id ON steelrecord (SeqNo, ID);
+
+-- 心跳的 MAX(DetectTime) 与按时间段查询 / 导出：WHERE DetectTime BETWEEN ? AND ?
+CREATE INDEX ix_steelrecord_detecttime ON steelrecord (DetectTime);
+
+-- 按流水号取板宽曲线：WHERE seqNo = ? ORDER BY len
+CREATE INDEX ix_steelwidth_seqno_len ON steelwidth (seqNo, len);
+
+-- ---------------------------------------------------------------------------
+-- 缺陷库（{database_type}defect，默认 ncdplatedefect）
+-- ---------------------------------------------------------------------------
+
+-- 标注查询：WHERE line_key = ? AND seq_no = ? [AND surface = ? AND view = ?]
+-- 先建复合索引再删除旧的单列索引（旧索引名为 SQLAlchemy index=True 的默认命名）。
+CREATE INDEX ix_defect_annotation_lksv ON defect_annotation (line_key, seq_no, surface, view);
+DROP INDEX ix_defect_annotation_line_key ON defect_annotation;
+DROP INDEX ix_defect_annotation_seq_no ON defect_annotation;
+
+-- ---------------------------------------------------------------------------
+-- 管理库（database.management_database，默认 DefectDetectionDatabBase）
+-- SQLite 备份库执行 DROP INDEX 时去掉 "ON <表名>"。
+-- ---------------------------------------------------------------------------
+
+CREATE INDEX ix_cache_records_lksv ON cache_records (line_key, seq_no, surface, view);
+-- 最新缓存流水号：max(seq_no) WHERE line_key = ? AND view = ?
+CREATE INDEX ix_cache_records_lvs ON cache_records (line_key, view, seq_no);
+DROP INDEX ix_cache_records_line_key ON cache_records;
+DROP INDEX ix_cache_records_seq_no ON cache_records;
+
+CREATE INDEX ix_defect_stats_lks ON defect_stats (line_key, seq_no, surface);
+DROP INDEX ix_defect_stats_line_key ON defect_stats;
+DROP INDEX ix_defect_stats_seq_no ON defect_stats;
+
+CREATE INDEX ix_steel_grades_ls ON steel_grades (line_key, seq_no);
+DROP INDEX ix_steel_grades_line_key ON steel_grades;
+DROP INDEX ix_steel_grades_seq_no ON steel_grades;
+
+CREATE INDEX ix_defect_grades_lks ON defect_grades (line_key, seq_no, surface);
+DROP INDEX ix_defect_grades_line_key ON defect_grades;
+DROP INDEX ix_defect_grades_seq_no ON defect_grades;
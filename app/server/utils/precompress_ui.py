@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import argparse
+import gzip
+import logging
+import os
+import sys
+import time
+from contextlib import suppress
+from pathlib import Path
+
+# Ensure repository root is on sys.path before importing app.*
+REPO_ROOT = Path(__file__).resolve().parents[3]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+logger = logging.getLogger(__name__)
+
+# 构建后为 UI 产物生成同名 .gz / .br 旁路文件，供 UiStaticFiles 按 Accept-Encoding 直接发送。
+PRECOMPRESS_SUFFIXES = frozenset({".wasm", ".js", ".html", ".css", ".json", ".svg"})
+PRECOMPRESS_MIN_BYTES = 1024
+
+
+def precompress_ui_assets(ui_dir: Path) -> int:
+    """生成缺失或过期的 .gz（安装了 brotli 时再生成 .br）旁路文件，返回新生成的文件数。"""
+    encoders = [(".gz", lambda data: gzip.compress(data, compresslevel=9, mtime=0))]
+    try:
+        import brotli  # type: ignore
+    except ImportError:
+        brotli = None
+    if brotli is not None:
+        encoders.insert(0, (".br", lambda data: brotli.compress(data, quality=11)))
+
+    generated = 0
+    for path in ui_dir.rglob("*"):
+        if path.suffix.lower() not in PRECOMPRESS_SUFFIXES or not path.is_file():
+            continue
+        source_stat = path.stat()
+        if source_stat.st_size < PRECOMPRESS_MIN_BYTES:
+            continue
+        data: bytes | None = None
+        for suffix, encode in encoders:
+            target = path.with_name(path.name + suffix)
+            with suppress(OSError):
+                if target.stat().st_mtime >= source_stat.st_mtime:
+                    continue
+            if data is None:
+                data = path.read_bytes()
+            # 先写临时文件再改名，服务端不会读到写了一半的压缩文件
+            tmp = target.with_name(target.name + ".tmp")
+            try:
+                tmp.write_bytes(encode(data))
+                os.replace(tmp, target)
+            except OSError:
+                with suppress(OSError):
+                    tmp.unlink()
+                raise
+            generated += 1
+    return generated
+
+
+def main() -> int:
+    from app.server.config_center import UI_BUILD_DIR
+
+    parser = argparse.ArgumentParser(description="Generate .gz/.br sidecars for the Qt WASM UI build output")
+    parser.add_argument(
+        "ui_dir",
+        nargs="?",
+        type=Path,
+        default=UI_BUILD_DIR,
+        help="UI build directory (default: DEFECT_UI_BUILD_DIR or the bundled WASM output)",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper(), format="%(levelname)s %(message)s")
+
+    ui_dir: Path = args.ui_dir
+    if not ui_dir.is_dir():
+        logger.error("UI build directory not found: %s", ui_dir)
+        return 1
+    started = time.monotonic()
+    generated = precompress_ui_assets(ui_dir)
+    logger.info("Precompressed %d UI asset(s) in %s (%.1fs)", generated, ui_dir, time.monotonic() - started)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -21,7 +21,7 @@ import uvicorn
 
 from app.server.config.settings import ENV_CONFIG_KEY
 from app.server.config_center import create_app
-from app.server.net_table import load_map_config, build_config_for_line
+from app.server.net_table import ConfigBuildJob, build_configs, load_map_config
 
 logger = logging.getLogger(__name__)
 REPO_ROOT = Path(__file__).resolve().parent
@@ -585,7 +585,7 @@ class LineProcessManager:
                         name=name,
                         label=item.get("label"),
                         priority=int(item.get("priority") or 0),
-                        state=str(item.get("state") or "ready"),
+                        state=str(item.get("state") or "ready").strip().lower(),
                         message=item.get("message"),
                         data=item.get("data") if isinstance(item.get("data"), dict) else {},
                         updated_at=updated_at_dt,
@@ -966,6 +966,9 @@ def main() -> None:
 
     manager = LineProcessManager(reload=args.reload)
     base_port = 8200
+    # 先收集全部 产线 × 视图 的生成任务，再一次性并发生成配置，最后按原顺序登记进程。
+    jobs: list[ConfigBuildJob] = []
+    pending: list[dict[str, Any]] = []
     for idx, line in enumerate(lines):
         mode = (line.get("mode") or "direct").lower()
         if mode != "direct":
@@ -1001,35 +1004,44 @@ def main() -> None:
             if effective_log:
                 line_payload["log"] = effective_log
             override_path = CURRENT_DIR / "generated" / line_key / view_key / "server.json"
-            config_path = build_config_for_line(
-                line_payload,
-                template,
-                view_name=view_key,
-                view_overrides=view_payload,
-                override_path=override_path,
-            )
-            logger.info(
-                "Starting line '%s' view '%s' on %s:%s with %s",
-                line_name,
-                view_key,
-                host,
-                view_port,
-                template.name,
+            jobs.append((line_payload, template, view_key, view_payload, override_path))
+            pending.append(
+                {
+                    "line": line,
+                    "line_key": line_key,
+                    "line_name": line_name,
+                    "host": host,
+                    "port": view_port,
+                    "view_key": view_key,
+                    "template": template,
+                    "defect_class_path": defect_class_path,
+                }
             )
-            manager.add_line(
-                LineProcess(
-                    key=line_key,
-                    name=line_name,
-                    host=host,
-                    port=view_port,
-                    profile=line.get("profile") or line.get("api_profile"),
-                    config_path=config_path,
-                    defect_class_path=defect_class_path,
-                    ip=line.get("ip"),
-                    kind=view_key,
-                    testdata_dir=testdata_dir,
-                )
+
+    for item, config_path in zip(pending, build_configs(jobs)):
+        line = item["line"]
+        logger.info(
+            "Starting line '%s' view '%s' on %s:%s with %s",
+            item["line_name"],
+            item["view_key"],
+            item["host"],
+            item["port"],
+            item["template"].name,
+        )
+        manager.add_line(
+            LineProcess(
+                key=item["line_key"],
+                name=item["line_name"],
+                host=item["host"],
+                port=item["port"],
+                profile=line.get("profile") or line.get("api_profile"),
+                config_path=config_path,
+                defect_class_path=item["defect_class_path"],
+                ip=line.get("ip"),
+                kind=item["view_key"],
+                testdata_dir=testdata_dir,
             )
+        )
 
     manager.start_all()
     config_center_log = _filter_log_config(log_defaults)